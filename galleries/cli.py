@@ -463,7 +463,7 @@ def query_sc(cla: argparse.Namespace, config: GlobalConfig) -> int:
         with _read_db(filename) as reader:
             query = table_query.query_from_args(cla.term, reader.fieldnames, tag_fields)
             galleries = table_query.sort_table(
-                (gallery for gallery in reader if query.match(gallery)),
+                filter(query.compile(), reader),
                 reader.fieldnames,
                 sort_field=cla.sort,
                 reverse_sort=cla.reverse,
@@ -541,7 +541,18 @@ def refresh_sc(cla: argparse.Namespace, config: GlobalConfig) -> int:
     sort_field = db_config.parser["refresh"].get("SortField", path_field)
     gardener.needed_fields.add(sort_field)
     if not cla.no_check:
-        gardener.set_update_count(path_field, count_field, paths.collection)
+        try:
+            count_workers = db_config.parser["refresh"].getint("CountWorkers")
+        except ValueError as err:
+            log.error("Invalid configuration setting for CountWorkers: %s", err)
+            return 1
+        gardener.set_update_count(
+            path_field,
+            count_field,
+            paths.collection,
+            mtime_field=db_config.parser["refresh"].get("MTimeField"),
+            max_workers=count_workers,
+        )
     # Third, see if there are enough values to perform implication
     try:
         error_status = set_tag_actions(gardener, db_config) and 1
@@ -642,7 +653,9 @@ def related_sc(cla: argparse.Namespace, config: GlobalConfig) -> int:
                 query = table_query.query_from_args(
                     search_terms, reader.fieldnames, tag_fields
                 )
-                galleries = (gallery for gallery in reader if query.match(gallery))
+                galleries = filter(
+                    query.compile(), util.parse_tag_fields(reader, tag_fields)
+                )
             else:
                 galleries = reader
             tag_sets = (gallery.merge_tags(*tag_fields) for gallery in galleries)
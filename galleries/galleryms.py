@@ -7,6 +7,7 @@ from __future__ import annotations
 import abc
 import dataclasses
 import fnmatch
+import functools
 import heapq
 import itertools
 import json
@@ -14,6 +15,8 @@ import math
 import operator
 import os
 import re
+import stat
+import sys
 import textwrap
 import warnings
 from collections import ChainMap, Counter, defaultdict
@@ -42,6 +45,11 @@ from typing import (
     TypeVar,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 if TYPE_CHECKING:
     from _typeshed import SupportsRichComparison
 
@@ -54,6 +62,8 @@ StrPath = str | Path
 TagSetT = TypeVar("TagSetT", bound="TagSet")
 Table = TypeVar("Table", bound="OverlapTable")
 TransitiveAliases = NewType("TransitiveAliases", tuple[str, str, str])
+FieldCache: TypeAlias = "MutableMapping[tuple[type, str], Any]"
+TermMatcher: TypeAlias = "Callable[[Gallery, FieldCache | None], Any]"
 
 
 class DisambiguationError(ValueError):
@@ -102,20 +112,35 @@ class ImplicationGraph:
     def _traverse(
         self, node: str, stack: MutableSequence[str], seen: MutableSet[str]
     ) -> str | None:
-        """Recursive function to visit each node in the graph"""
+        """Visit each node reachable from *node*, depth first.
+
+        The walk keeps its own stack of neighbor iterators instead of
+        recursing, so the depth of the graph is not limited by the
+        interpreter's recursion limit.
+        """
+        # Mirror the recursion stack in a set for constant-time lookup
+        on_stack = set(stack)
         # Mark current node as visited and add to recursion stack
         seen.add(node)
         stack.append(node)
-        # If any neighbor is visited and in recursion stack
-        # then graph is cyclic
-        for neighbor in self.graph[node]:
-            if neighbor not in seen:
-                if cycle_0 := self._traverse(neighbor, stack, seen):
-                    return cycle_0
-            elif neighbor in stack:
-                return neighbor
-        # Pop node from stack -- its descendants are free of cycles
-        stack.pop()
+        on_stack.add(node)
+        neighbors: list[Iterator[str]] = [iter(self.graph.get(node, ()))]
+        while neighbors:
+            for neighbor in neighbors[-1]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    neighbors.append(iter(self.graph.get(neighbor, ())))
+                    break
+                # If any neighbor is visited and in recursion stack
+                # then graph is cyclic
+                if neighbor in on_stack:
+                    return neighbor
+            else:
+                # Pop node from stack -- its descendants are free of cycles
+                neighbors.pop()
+                on_stack.discard(stack.pop())
         return None
 
     def find_cycle(self) -> list[str] | None:
@@ -127,7 +152,6 @@ class ImplicationGraph:
         The first and last node in the list will be the same, to make it clear
         that it is cyclic.
         """
-        # We don't expect to exceed max recursion depth
         nodes_seen = TagSet()
         recursion_stack: list[str] = []
         for node in list(self.graph):
@@ -142,12 +166,14 @@ class ImplicationGraph:
         return self.graph.get(tag, TagSet())
 
     def descendants_of(self, tag: str) -> TagSet:
-        current_tags = self.tags_implied_by(tag)
-        descendants = current_tags
+        # Copy, so that the sets stored in the graph are never updated
+        current_tags = TagSet(self.tags_implied_by(tag))
+        descendants = TagSet(current_tags)
         while current_tags:
             new_tags = TagSet()
             for implied_tag in current_tags:
                 new_tags.update(self.tags_implied_by(implied_tag))
+            new_tags -= descendants
             descendants.update(new_tags)
             current_tags = new_tags
         return descendants
@@ -155,9 +181,12 @@ class ImplicationGraph:
     def join_descendants(self, tagset: TagSet, tag: str) -> None:
         """Add *tag* and its descendants to *tagset*."""
         tagset.add(tag)
-        for neighbor in self.graph[tag]:
-            if neighbor not in tagset:
-                self.join_descendants(tagset, neighbor)
+        stack = [tag]
+        while stack:
+            for neighbor in self.graph.get(stack.pop(), ()):
+                if neighbor not in tagset:
+                    tagset.add(neighbor)
+                    stack.append(neighbor)
 
 
 class Implicator(ImplicationGraph):
@@ -168,17 +197,32 @@ class Implicator(ImplicationGraph):
         implications: Iterable[RegularImplication] | None = None,
         aliases: MutableMapping[str, str] | None = None,
     ) -> None:
+        # Descendants of each tag, filled in as tags are implicated
+        self._descendants: dict[str, frozenset[str]] = {}
         super().__init__()
-        self.implications = set(implications or [])
-        self.aliases = ChainMap(aliases or {})
+        self.implications: set[RegularImplication] = set()
+        self.aliases: MutableMapping[str, str] = ChainMap(aliases or {})
         if implications is not None:
-            for implication in implications:
-                self.add(implication)
+            self.add_many(implications)
 
     def add(self, implication: RegularImplication) -> None:
         self.add_edge(implication.antecedent, implication.consequent)
         self.implications.add(implication)
 
+    def add_many(self, implications: Iterable[RegularImplication]) -> None:
+        """Add each of *implications*, forgetting descendants only once."""
+        # Keep the given order, so that graph walks are deterministic
+        new = list(implications)
+        graph = self.graph
+        for implication in new:
+            graph[implication.antecedent].add(implication.consequent)
+        self.implications.update(new)
+        self._descendants.clear()
+
+    def add_edge(self, antecedent: str, *consequent: str) -> None:
+        super().add_edge(antecedent, *consequent)
+        self._descendants.clear()
+
     def validate_implications_not_aliased(
         self,
     ) -> list[AliasedImplication]:
@@ -216,8 +260,13 @@ class Implicator(ImplicationGraph):
 
     def implicate(self, tagset: TagSet) -> None:
         tagset.apply_aliases(self.aliases)
-        for tag in list(tagset):
-            self.join_descendants(tagset, tag)
+        for tag in [tag for tag in tagset if tag in self.graph]:
+            try:
+                descendants = self._descendants[tag]
+            except KeyError:
+                descendants = frozenset(self.descendants_of(tag))
+                self._descendants[tag] = descendants
+            tagset.update(descendants)
 
 
 class TagSet(set[str]):
@@ -233,18 +282,22 @@ class TagSet(set[str]):
     @classmethod
     def from_tagstring(cls: type[TagSetT], tagstring: str) -> TagSetT:
         """Construct from string with whitespace-separated tags"""
-        return cls(split_on_whitespace(tagstring.lower()))
+        # The same tags recur across many galleries; interning lets them all
+        # share one string, and lets comparisons succeed on identity
+        return cls(map(sys.intern, split_on_whitespace(tagstring.lower())))
 
     def __str__(self) -> str:
         return " ".join(sorted(self))
 
     def implied_tags(self: TagSetT, implications: Iterable[BaseImplication]) -> TagSetT:
         consequents = type(self)()
-        for implication in implications:
+        if isinstance(implications, DescriptorSet):
             for tag in self:
-                if implied := implication.match(tag):
-                    consequents.add(implied)
-                    break
+                consequents.update(implications.match_all(tag))
+            return consequents
+        if not isinstance(implications, ImplicationSet):
+            implications = ImplicationSet(implications)
+        consequents.update(implications.implied_by(self))
         return consequents
 
     def aliased_tags(self: TagSetT, aliases: Mapping[str, str]) -> TagSetT:
@@ -255,9 +308,20 @@ class TagSet(set[str]):
 
     def apply_implications(self, implications: Iterable[BaseImplication]) -> None:
         """Update with *implications*."""
+        if not isinstance(implications, (DescriptorSet, ImplicationSet)):
+            # Index the implications once, rather than on every iteration
+            implications = ImplicationSet(implications)
         current_tags = self
         while implications:
-            new_tags = current_tags.implied_tags(implications)
+            if isinstance(implications, ImplicationSet):
+                # Follow chains of regular implications in a single step
+                new_tags = type(self)(
+                    implications.implied_by(current_tags, transitive=True)
+                )
+            else:
+                new_tags = current_tags.implied_tags(implications)
+            # Tags already in the set have been through the implications
+            new_tags -= self
             if not new_tags:
                 # No new tags implied. Exit.
                 break
@@ -268,10 +332,13 @@ class TagSet(set[str]):
 
     def apply_aliases(self, aliases: Mapping[str, str]) -> None:
         """Update with *aliases*, translating tags from key to value."""
-        for alias, tag in aliases.items():
-            if alias in self:
-                self.remove(alias)
-                self.add(tag)
+        # Look up each tag rather than each alias: tag sets are usually much
+        # smaller than alias tables, and most tags are not aliased at all.
+        aliased = [tag for tag in self if tag in aliases]
+        if not aliased:
+            return
+        self.difference_update(aliased)
+        self.update(aliases[alias] for alias in aliased)
 
 
 class Gallery(dict[str, object]):
@@ -311,9 +378,13 @@ class Gallery(dict[str, object]):
         Otherwise return the ``Path``.
         """
         path = self.get_folder(field, cwd=cwd)
-        if not path.exists():
-            raise FileNotFoundError(path)
-        if not path.is_dir():
+        # Stat once, rather than once each for exists and is_dir
+        try:
+            mode = path.stat().st_mode
+        except OSError:
+            # As Path.exists would, treat any failure to stat as not found
+            raise FileNotFoundError(path) from None
+        if not stat.S_ISDIR(mode):
             raise NotADirectoryError(path)
         return path
 
@@ -324,9 +395,7 @@ class Gallery(dict[str, object]):
         """
         with os.scandir(folder_path) as scandir_it:
             count = sum(
-                1
-                for entry in scandir_it
-                if not entry.name.startswith(".") and entry.is_file()
+                1 for entry in scandir_it if entry.name[0] != "." and entry.is_file()
             )
         self[field] = count
 
@@ -342,14 +411,13 @@ class SearchTerm(abc.ABC):
     fields: list[str]
 
     @abc.abstractmethod
-    def match(
-        self, gallery: Gallery, cache: MutableMapping[str, Any] | None = None
-    ) -> Any:
+    def match(self, gallery: Gallery, cache: FieldCache | None = None) -> Any:
         """Return a truthy value if *gallery* is matched by this term.
 
-        Optional *cache* is a mapping of fields and field values that have
-        already been parsed by a ``SearchTerm.match`` method. *cache* will be
-        updated if a value is parsed. *gallery* will not be modified.
+        Optional *cache* is a mapping of field values that have already been
+        parsed by a ``SearchTerm.match`` method, keyed by the type parsed to
+        and the field name. *cache* will be updated if a value is parsed.
+        *gallery* will not be modified.
         """
 
     def disambiguate_fields(self, fieldnames: Sequence[str]) -> None:
@@ -364,22 +432,7 @@ class SearchTerm(abc.ABC):
         Raise ``MultipleCandidatesError`` if there are multiple possible field
         names in *fieldnames*.
         """
-        disambiguated = []
-        for field in self.fields:
-            specifier = field.casefold()
-            candidates = [
-                fieldname
-                for fieldname in fieldnames
-                if fieldname.casefold().startswith(specifier)
-            ]
-            if len(candidates) < 1:
-                msg = f"No field names starting with '{field}'"
-                raise NoCandidatesError(msg)
-            if len(candidates) > 1:
-                msg = f"Field '{field}' is ambiguous between {candidates}"
-                raise MultipleCandidatesError(msg)
-            disambiguated.append(candidates[0])
-        self.fields = disambiguated
+        self.fields = list(_disambiguate(tuple(self.fields), tuple(fieldnames)))
 
     @staticmethod
     def _rectify_fields(arg: str | Iterable[str] | None) -> list[str]:
@@ -388,11 +441,44 @@ class SearchTerm(abc.ABC):
         return list(arg) if arg is not None else []
 
     def tagsets(
-        self, gallery: Gallery, cache: MutableMapping[str, Any] | None = None
+        self, gallery: Gallery, cache: FieldCache | None = None
     ) -> Iterator[TagSet]:
-        cache = cache or {}
+        if cache is None:
+            cache = {}
         for fieldname in self.fields:
-            yield cache.setdefault(fieldname, gallery.normalize_tags(fieldname))
+            key = (TagSet, fieldname)
+            try:
+                tagset = cache[key]
+            except KeyError:
+                tagset = cache[key] = gallery.normalize_tags(fieldname)
+            yield tagset
+
+
+@functools.lru_cache(maxsize=256)
+def _disambiguate(
+    fields: tuple[str, ...], fieldnames: tuple[str, ...]
+) -> tuple[str, ...]:
+    """Resolve *fields* between *fieldnames* for ``disambiguate_fields``.
+
+    Terms searching the same fields of the same table share the result.
+    """
+    disambiguated = []
+    folded_fieldnames = [(fieldname, fieldname.casefold()) for fieldname in fieldnames]
+    for field in fields:
+        specifier = field.casefold()
+        candidates = [
+            fieldname
+            for fieldname, folded in folded_fieldnames
+            if folded.startswith(specifier)
+        ]
+        if len(candidates) < 1:
+            msg = f"No field names starting with '{field}'"
+            raise NoCandidatesError(msg)
+        if len(candidates) > 1:
+            msg = f"Field '{field}' is ambiguous between {candidates}"
+            raise MultipleCandidatesError(msg)
+        disambiguated.append(candidates[0])
+    return tuple(disambiguated)
 
 
 class TagSearchTerm(SearchTerm):
@@ -417,9 +503,7 @@ class WholeSearchTerm(TagSearchTerm):
     True
     """
 
-    def match(
-        self, gallery: Gallery, cache: MutableMapping[str, Any] | None = None
-    ) -> str | None:
+    def match(self, gallery: Gallery, cache: FieldCache | None = None) -> str | None:
         for tagset in self.tagsets(gallery, cache):
             if self.word in tagset:
                 return self.word
@@ -431,25 +515,136 @@ class WildcardSearchTerm(TagSearchTerm):
 
     Uses :module:`fnmatch`, which supports Unix shell-style wildcards
 
+    If *regex* is given, tags are matched against it instead of against the
+    translation of *word*, which is then only used to represent the term.
+
     >>> term = WildcardSearchTerm("tok*", ["Tags"])
     >>> bool(term.match(Gallery(Tags="tok1")))
     True
     """
 
-    def __init__(self, word: str, fields: str | Iterable[str] | None = None) -> None:
+    def __init__(
+        self,
+        word: str,
+        fields: str | Iterable[str] | None = None,
+        regex: re.Pattern[str] | None = None,
+    ) -> None:
         super().__init__(word, fields=fields)
-        self.regex = re.compile(fnmatch.translate(word))
+        if regex is not None:
+            self.regex = regex
+            self._match_tag: Callable[[str], Any] = regex.match
+        else:
+            self.regex = re.compile(fnmatch.translate(word))
+            self._match_tag = self._tag_matcher(word, self.regex)
+
+    @staticmethod
+    def _tag_matcher(word: str, regex: re.Pattern[str]) -> Callable[[str], Any]:
+        """Return a function that tests a tag against the pattern *word*.
+
+        Patterns whose only wildcards are a leading and/or trailing ``*``, or
+        a single ``*`` in the middle, are tested with string methods instead
+        of *regex*.
+        """
+        if "?" in word or "[" in word:
+            return regex.match
+        parts = word.split("*")
+        if len(parts) == 1:
+            return word.__eq__
+        if len(parts) == 2:
+            prefix, suffix = parts
+            if not suffix:
+                return lambda tag: tag.startswith(prefix)
+            if not prefix:
+                return lambda tag: tag.endswith(suffix)
+            min_length = len(prefix) + len(suffix)
+            return lambda tag: (
+                len(tag) >= min_length
+                and tag.startswith(prefix)
+                and tag.endswith(suffix)
+            )
+        if len(parts) == 3 and not parts[0] and not parts[2]:
+            middle = parts[1]
+            return lambda tag: middle in tag
+        return regex.match
+
+    @classmethod
+    def union(cls, terms: Sequence[WildcardSearchTerm]) -> WildcardSearchTerm:
+        """Combine *terms* into one term that matches if any of them match.
+
+        The patterns are joined into a single regular expression, so each tag
+        is matched once rather than once per term. *terms* should all search
+        the same fields; the fields of the first term are used.
+
+        >>> term = WildcardSearchTerm.union(
+        ...     [WildcardSearchTerm("a*", ["Tags"]), WildcardSearchTerm("*z", ["Tags"])]
+        ... )
+        >>> term
+        WildcardSearchTerm('a* *z', fields=['Tags'])
+        >>> bool(term.match(Gallery(Tags="xyz")))
+        True
+        """
+        return cls(
+            " ".join(term.word for term in terms),
+            fields=terms[0].fields,
+            regex=re.compile("|".join(term.regex.pattern for term in terms)),
+        )
 
     def match(
-        self, gallery: Gallery, cache: MutableMapping[str, Any] | None = None
+        self, gallery: Gallery, cache: FieldCache | None = None
     ) -> re.Match[str] | None:
+        match_tag = self._match_tag
         for tagset in self.tagsets(gallery, cache):
             for tag in tagset:
-                if match := self.regex.match(tag):
-                    return match
+                if match_tag(tag):
+                    # Only the tag that matched goes through the regex
+                    return self.regex.match(tag)
         return None
 
 
+class WholeWordsSearchTerm(SearchTerm):
+    """Search term that matches several whole tags in the same fields at once
+
+    If *require_all* is true, every word must be among the tags for the term
+    to match; otherwise any one of them will do.
+
+    >>> term = WholeWordsSearchTerm(["tok1", "tok2"], ["Tags"], require_all=True)
+    >>> bool(term.match(Gallery(Tags="tok1 tok3")))
+    False
+    >>> bool(term.match(Gallery(Tags="tok1 tok2 tok3")))
+    True
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str],
+        fields: str | Iterable[str] | None = None,
+        require_all: bool = False,
+    ) -> None:
+        self.words = frozenset(words)
+        self.fields = self._rectify_fields(fields)
+        self.require_all = require_all
+
+    def __repr__(self) -> str:
+        parameters = [repr(sorted(self.words))]
+        if self.fields:
+            parameters.append(f"fields={self.fields!r}")
+        if self.require_all:
+            parameters.append("require_all=True")
+        return f"{type(self).__name__}({', '.join(parameters)})"
+
+    def match(self, gallery: Gallery, cache: FieldCache | None = None) -> bool:
+        if self.require_all:
+            missing = self.words
+            for tagset in self.tagsets(gallery, cache):
+                missing = missing.difference(tagset)
+                if not missing:
+                    return True
+            return False
+        return any(
+            not self.words.isdisjoint(tagset) for tagset in self.tagsets(gallery, cache)
+        )
+
+
 class NumericCondition(SearchTerm):
     """Search term that compares its argument to numbers in fields
 
@@ -477,20 +672,26 @@ class NumericCondition(SearchTerm):
             parameters.append(f"fields={self.fields!r}")
         return f"{type(self).__name__}({', '.join(parameters)})"
 
-    def match(
-        self, gallery: Gallery, cache: MutableMapping[str, Any] | None = None
-    ) -> bool:
-        cache = cache or {}
-        values: list[float] = []
+    def match(self, gallery: Gallery, cache: FieldCache | None = None) -> bool:
+        if cache is None:
+            cache = {}
+        comp_func = self.comp_func
+        argument = self.argument
+        matched = False
         for fieldname in self.fields:
-            try:
-                value = cache.setdefault(fieldname, gallery[fieldname])
-                values.append(float(value))
-            except (ValueError, TypeError):
-                # Rows with null or invalid values _will_ be excluded from
-                # results
-                return False
-        return any(self.comp_func(value, self.argument) for value in values)
+            key = (float, fieldname)
+            if (value := cache.get(key)) is None:
+                try:
+                    value = cache[key] = float(gallery[fieldname])
+                except (ValueError, TypeError):
+                    # Rows with null or invalid values _will_ be excluded from
+                    # results
+                    return False
+            # Compare as each value is parsed, but keep parsing the rest, so
+            # that an invalid value in a later field still excludes the row
+            if not matched and comp_func(value, argument):
+                matched = True
+        return matched
 
 
 class CardinalityCondition(NumericCondition):
@@ -501,9 +702,7 @@ class CardinalityCondition(NumericCondition):
     True
     """
 
-    def match(
-        self, gallery: Gallery, cache: MutableMapping[str, Any] | None = None
-    ) -> Any:
+    def match(self, gallery: Gallery, cache: FieldCache | None = None) -> Any:
         value = sum(len(tagset) for tagset in self.tagsets(gallery, cache))
         return self.comp_func(value, self.argument)
 
@@ -529,6 +728,7 @@ class Query:
         self.conjuncts = list(conjuncts or [])
         self.negations = list(negations or [])
         self.disjuncts = list(disjuncts or [])
+        self._compiled: tuple[tuple, Callable[[Gallery], bool]] | None = None
 
     def __repr__(self) -> str:
         attrs = ", ".join(
@@ -542,18 +742,84 @@ class Query:
         return bool(self.conjuncts or self.negations or self.disjuncts)
 
     def match(self, gallery: Gallery) -> bool:
-        # data_cache will be modified as field data is parsed
-        data_cache: dict[str, Any] = {}
-        conjuncts = [t.match(gallery, data_cache) for t in self.conjuncts]
-        negations = [t.match(gallery, data_cache) for t in self.negations]
-        disjuncts = [t.match(gallery, data_cache) for t in self.disjuncts]
-        return (
-            all(conjuncts)
-            and not any(negations)
-            and (any(disjuncts) or not disjuncts)
-            #                   ^
-            # If disjuncts is merely empty, still return True
-        )
+        # Reuse the matcher built on an earlier call, unless the terms have
+        # changed since
+        terms = (tuple(self.conjuncts), tuple(self.negations), tuple(self.disjuncts))
+        if self._compiled is None or self._compiled[0] != terms:
+            self._compiled = (terms, self.compile())
+        return self._compiled[1](gallery)
+
+    def compile(self) -> Callable[[Gallery], bool]:
+        """Return a function that matches galleries like ``Query.match``.
+
+        The terms are bound when this is called, so later changes to the
+        query are not seen by the returned function. Evaluation stops at the
+        first term that decides the result.
+
+        >>> matcher = Query([WholeSearchTerm("tok1", ["Tags"])]).compile()
+        >>> matcher(Gallery(Tags="tok1 tok2")), matcher(Gallery(Tags="tok2"))
+        (True, False)
+        """
+        conjuncts = tuple(self._grouped_matchers(self.conjuncts, require_all=True))
+        negations = tuple(self._grouped_matchers(self.negations))
+        disjuncts = tuple(self._grouped_matchers(self.disjuncts))
+
+        def matcher(gallery: Gallery) -> bool:
+            # data_cache will be modified as field data is parsed
+            data_cache: FieldCache = {}
+            # Plain loops, rather than all() and any() over generators, save
+            # creating three generator objects per gallery
+            for match in conjuncts:
+                if not match(gallery, data_cache):
+                    return False
+            for match in negations:
+                if match(gallery, data_cache):
+                    return False
+            if not disjuncts:
+                # If disjuncts is merely empty, still return True
+                return True
+            for match in disjuncts:
+                if match(gallery, data_cache):
+                    return True
+            return False
+
+        return matcher
+
+    @staticmethod
+    def _grouped_matchers(
+        terms: Iterable[SearchTerm], require_all: bool = False
+    ) -> Iterator[TermMatcher]:
+        """Yield match functions for *terms*, grouping terms where possible.
+
+        Whole tag terms that search the same fields are tested together as
+        one set operation. If only one of *terms* need match, wildcard terms
+        that search the same fields are merged into one as well. The grouped
+        whole tag terms come first, being the cheapest, then the other terms
+        in order, then the wildcards.
+        """
+        wholes: dict[tuple[str, ...], list[WholeSearchTerm]] = {}
+        wildcards: dict[tuple[str, ...], list[WildcardSearchTerm]] = {}
+        others: list[SearchTerm] = []
+        for term in terms:
+            if type(term) is WholeSearchTerm:
+                wholes.setdefault(tuple(term.fields), []).append(term)
+            elif type(term) is WildcardSearchTerm and not require_all:
+                wildcards.setdefault(tuple(term.fields), []).append(term)
+            else:
+                others.append(term)
+        for fields, whole_group in wholes.items():
+            if len(whole_group) > 1:
+                words = (term.word for term in whole_group)
+                yield WholeWordsSearchTerm(words, fields, require_all).match
+            else:
+                yield whole_group[0].match
+        for term in others:
+            yield term.match
+        for wildcard_group in wildcards.values():
+            if len(wildcard_group) > 1:
+                yield WildcardSearchTerm.union(wildcard_group).match
+            else:
+                yield wildcard_group[0].match
 
     def all_terms(self) -> Iterator[SearchTerm]:
         yield from self.conjuncts
@@ -593,39 +859,16 @@ class ArgumentParser:
         self.compile()
 
     def compile(self) -> None:
-        relationals = "|".join(
-            f"(?:{re.escape(exp)})" for exp in self.relationals if exp
+        self._regex = _argument_regex(
+            tuple(exp for exp in self.relationals if exp),
+            self.fieldname_chars,
+            self.tag_chars,
+            self.wildcard,
+            self.not_operator,
+            self.or_operator,
+            self.field_tag_sep,
+            self.field_number_sep,
         )
-        wildcard = re.escape(self.wildcard)
-        not_operator = re.escape(self.not_operator)
-        or_operator = re.escape(self.or_operator)
-        field_tag_sep = re.escape(self.field_tag_sep)
-        field_number_sep = re.escape(self.field_number_sep)
-        re_pattern = rf"""
-                (?P<logical_group> {not_operator}|{or_operator}) ?
-                                                # logical operator
-            (?: (?:
-            # NUMERIC SPECIFIER
-            (?: (?P<set_branch>
-            n \[
-            (?P<set_field> [{self.fieldname_chars}]+) ?
-                \]                              # field specifier, optional
-            ) | (?P<num_branch>
-            (?P<num_field> [{self.fieldname_chars}]+)
-                                                # field specifier, mandatory
-            ) ) {field_number_sep}
-                (?P<relation> {relationals}) ?  # relational operator
-            (?P<num> -?[0-9]+)                  # constant
-            ) | (?:
-            # TAG SPECIFIER
-            (?:
-                (?P<tag_field> [{self.fieldname_chars}]+){field_tag_sep}
-            ) ?                                 # field specifier, optional
-            (?P<tag> [{self.tag_chars}{wildcard}]+)
-                                                # search term
-            ) )
-        """
-        self._regex = re.compile(re_pattern, re.VERBOSE | re.IGNORECASE)
 
     def parse_args(self, args: Iterable[str]) -> Query:
         """Parse a series of argument tokens."""
@@ -684,6 +927,55 @@ class ArgumentParser:
         raise ArgumentParsingError
 
 
+@functools.lru_cache(maxsize=8)
+def _argument_regex(
+    relationals: tuple[str, ...],
+    fieldname_chars: str,
+    tag_chars: str,
+    wildcard: str,
+    not_operator: str,
+    or_operator: str,
+    field_tag_sep: str,
+    field_number_sep: str,
+) -> re.Pattern[str]:
+    """Build the pattern that ``ArgumentParser`` matches argument tokens with.
+
+    Parsers that share an operator configuration share the compiled pattern.
+    """
+    relational_group = "|".join(f"(?:{re.escape(exp)})" for exp in relationals)
+    wildcard = re.escape(wildcard)
+    not_operator = re.escape(not_operator)
+    or_operator = re.escape(or_operator)
+    field_tag_sep = re.escape(field_tag_sep)
+    field_number_sep = re.escape(field_number_sep)
+    re_pattern = rf"""
+            (?P<logical_group> {not_operator}|{or_operator}) ?
+                                            # logical operator
+        (?: (?:
+        # NUMERIC SPECIFIER
+        (?: (?P<set_branch>
+        n \[
+        (?P<set_field> [{fieldname_chars}]+) ?
+            \]                              # field specifier, optional
+        ) | (?P<num_branch>
+        (?P<num_field> [{fieldname_chars}]+)
+                                            # field specifier, mandatory
+        ) ) {field_number_sep}
+            (?P<relation> {relational_group}) ?
+                                            # relational operator
+        (?P<num> -?[0-9]+)                  # constant
+        ) | (?:
+        # TAG SPECIFIER
+        (?:
+            (?P<tag_field> [{fieldname_chars}]+){field_tag_sep}
+        ) ?                                 # field specifier, optional
+        (?P<tag> [{tag_chars}{wildcard}]+)
+                                            # search term
+        ) )
+    """
+    return re.compile(re_pattern, re.VERBOSE | re.IGNORECASE)
+
+
 class BaseImplication(abc.ABC):
     @abc.abstractmethod
     def match(self, tag: str) -> str | None:
@@ -703,21 +995,64 @@ class DescriptorImplication(BaseImplication):
     """
 
     word: str
-    pattern: re.Pattern[str] = dataclasses.field(init=False, compare=False)
+    prefix: str = dataclasses.field(init=False, compare=False)
 
     def __post_init__(self) -> None:
-        object.__setattr__(self, "pattern", re.compile(f"\\A{self.word}_(.+)"))
+        object.__setattr__(self, "prefix", f"{self.word}_")
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self.word!r})"
 
     def match(self, tag: str) -> str | None:
         """Return tag string matched after the descriptor or None."""
-        if match := self.pattern.search(tag):
-            return match.group(1)
+        prefix = self.prefix
+        if len(tag) > len(prefix) and tag.startswith(prefix):
+            return tag[len(prefix) :]
         return None
 
 
+class DescriptorSet(Collection[DescriptorImplication]):
+    """A collection of descriptor implications that are matched together
+
+    Rather than trying each descriptor against a tag, look up each
+    underscore-separated prefix of the tag among the descriptor words.
+
+    >>> descriptors = DescriptorSet(["light", "light_green"])
+    >>> sorted(descriptors.match_all("light_green_shirt"))
+    ['green_shirt', 'shirt']
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self.words = frozenset(words)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({sorted(self.words)!r})"
+
+    def __contains__(self, implication: object) -> bool:
+        return (
+            isinstance(implication, DescriptorImplication)
+            and implication.word in self.words
+        )
+
+    def __iter__(self) -> Iterator[DescriptorImplication]:
+        return map(DescriptorImplication, self.words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def match_all(self, tag: str) -> Iterator[str]:
+        """Yield the tag string after each descriptor that *tag* starts with."""
+        words = self.words
+        sep = tag.find("_")
+        while sep != -1:
+            remainder = tag[sep + 1 :]
+            if not remainder:
+                break
+            if tag[:sep] in words:
+                yield remainder
+            sep = tag.find("_", sep + 1)
+
+
 @dataclasses.dataclass(frozen=True)
 class RegularImplication(BaseImplication):
     """Store a regular implication.
@@ -728,6 +1063,11 @@ class RegularImplication(BaseImplication):
     antecedent: str
     consequent: str
 
+    def __post_init__(self) -> None:
+        # The same few consequents recur across many implications
+        object.__setattr__(self, "antecedent", sys.intern(self.antecedent))
+        object.__setattr__(self, "consequent", sys.intern(self.consequent))
+
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self.antecedent!r}, {self.consequent!r})"
 
@@ -738,6 +1078,87 @@ class RegularImplication(BaseImplication):
         return None
 
 
+class ImplicationSet(Collection[BaseImplication]):
+    """A collection of implications bucketed by type
+
+    Regular implications are looked up by antecedent, and descriptor
+    implications are matched together as a ``DescriptorSet``. Any other
+    implication is tried against each tag in turn.
+
+    >>> implications = ImplicationSet(
+    ...     [RegularImplication("cat", "animal"), DescriptorImplication("black")]
+    ... )
+    >>> sorted(implications.implied_by({"black_cat", "cat"}))
+    ['animal', 'cat']
+    """
+
+    def __init__(self, implications: Iterable[BaseImplication] = ()) -> None:
+        self._implications = tuple(implications)
+        self.regular: dict[str, list[str]] = {}
+        self.others: list[BaseImplication] = []
+        words = []
+        for implication in self._implications:
+            if isinstance(implication, RegularImplication):
+                consequents = self.regular.setdefault(implication.antecedent, [])
+                consequents.append(implication.consequent)
+            elif isinstance(implication, DescriptorImplication):
+                words.append(implication.word)
+            else:
+                self.others.append(implication)
+        self.descriptors = DescriptorSet(words)
+        # Every tag reachable from an antecedent through regular
+        # implications, filled in as antecedents are met
+        self._closure: dict[str, frozenset[str]] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._implications)!r})"
+
+    def __contains__(self, implication: object) -> bool:
+        return implication in self._implications
+
+    def __iter__(self) -> Iterator[BaseImplication]:
+        return iter(self._implications)
+
+    def __len__(self) -> int:
+        return len(self._implications)
+
+    def implied_by(
+        self, tags: Collection[str], *, transitive: bool = False
+    ) -> Iterator[str]:
+        """Yield the tags implied by any of *tags*.
+
+        If *transitive* is True, also yield the tags implied by those through
+        regular implications, and so on.
+        """
+        regular = self.closure if transitive else self.regular.__getitem__
+        match_all = self.descriptors.match_all
+        for tag in tags:
+            if tag in self.regular:
+                yield from regular(tag)
+            yield from match_all(tag)
+        for implication in self.others:
+            for tag in tags:
+                if implied := implication.match(tag):
+                    yield implied
+                    break
+
+    def closure(self, tag: str) -> frozenset[str]:
+        """Return every tag reachable from *tag* by regular implications."""
+        try:
+            return self._closure[tag]
+        except KeyError:
+            pass
+        reached: set[str] = set()
+        stack = list(self.regular.get(tag, ()))
+        while stack:
+            node = stack.pop()
+            if node not in reached:
+                reached.add(node)
+                stack.extend(self.regular.get(node, ()))
+        closure = self._closure[tag] = frozenset(reached)
+        return closure
+
+
 class FieldFormat:
     """Specify output formatting for a field in a table.
 
@@ -754,6 +1175,19 @@ class FieldFormat:
     FieldFormat.EFFECTS, respectively.
     """
 
+    __slots__ = (
+        "width",
+        "_fg",
+        "fg",
+        "_bg",
+        "bg",
+        "_effect",
+        "effect",
+        "sgr",
+        "prefix",
+        "suffix",
+    )
+
     REMAINING_SPACE = REM = -1
 
     COLORS: ClassVar[dict[str, tuple[str, str]]] = {
@@ -802,17 +1236,21 @@ class FieldFormat:
             self.effect = str(effect)
             warnings.warn(f"using string value of argument {self.effect!r}")
         self.sgr = ";".join(s for s in (self.effect, self.fg, self.bg) if s)
+        # Escape sequences to put around a line, empty if there is no style
+        self.prefix = f"\033[{self.sgr}m" if self.sgr else ""
+        self.suffix = "\033[0m" if self.sgr else ""
 
     def colorize(self, lines: Iterable[str]) -> Iterator[str]:
-        for line in lines:
-            if not self.sgr:
-                yield line
-            else:
-                yield f"\033[{self.sgr}m{line}\033[0m"
+        if not self.sgr:
+            return iter(lines)
+        prefix, suffix = self.prefix, self.suffix
+        return (prefix + line + suffix for line in lines)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return all(
+                getattr(self, attr) == getattr(other, attr) for attr in self.__slots__
+            )
         return NotImplemented
 
     def __repr__(self) -> str:
@@ -859,7 +1297,7 @@ class Tabulator:
         _wrappers is *not* ordered like field_fmts is.
         """
         return {
-            field: textwrap.TextWrapper(width=fmt.width)
+            field: _text_wrapper(fmt.width)
             for field, fmt in self.field_fmts.items()
             if fmt.width != FieldFormat.REMAINING_SPACE
         }
@@ -878,8 +1316,15 @@ class Tabulator:
                 If rows is empty, yield nothing.
         """
         wrappers = self._wrappers()
+        rem_fields = [
+            field
+            for field, fmt in self.field_fmts.items()
+            if fmt.width == FieldFormat.REMAINING_SPACE
+        ]
 
-        # Wrap to max widths
+        # Wrap to max widths, recording the longest line in each column as
+        # the rows are wrapped
+        sizes = dict.fromkeys(self.field_fmts, 0)
         wrapped_rows: list[dict[str, str | list[str]]] = []
         for row in rows:
             new_row: dict[str, str | list[str]] = {}
@@ -887,90 +1332,98 @@ class Tabulator:
                 text = str(row[field])
                 max_width = fmt.width
                 if not text:
-                    new_row[field] = [text]
+                    cell: str | list[str] = [text]
                     # textwrap.TextWrapper returns [] on '',
                     # not [''] as expected (Issue15510)
                 elif max_width != FieldFormat.REMAINING_SPACE:
-                    new_row[field] = wrappers[field].wrap(text)
+                    cell = self._wrap(wrappers[field], text)
                 else:
-                    new_row[field] = text
+                    cell = text
+                new_row[field] = cell
+                if max_width == FieldFormat.REMAINING_SPACE:
+                    size = len(cell)
+                else:
+                    size = max(map(len, cell), default=0)
+                if size > sizes[field]:
+                    sizes[field] = size
             # Fields not in field_fmts do not get added
             wrapped_rows.append(new_row)
         if not wrapped_rows:
             # Exit in case of empty input
             return
 
-        # Calculate actual widths after wrapping once
-        sizes: dict[str, int] = {}
-        n_remaining_cols = 0
-        for field, fmt in self.field_fmts.items():
-            # Record the longest line in each wrapped column
-            if fmt.width == FieldFormat.REMAINING_SPACE:
-                sizes[field] = max(len(row[field]) for row in wrapped_rows)
-                n_remaining_cols += 1
-            else:
-                sizes[field] = max(
-                    len(val) for row in wrapped_rows for val in row[field]
-                )
-
         # Adjust wrapper widths
         whitespace_used = (
             self.left_margin + self.right_margin + (len(sizes) - 1) * self.padding
         )
         total_used = whitespace_used + sum(sizes.values())
-        if total_used <= self.total_width or n_remaining_cols <= 0:
-            for field, field_size in sizes.items():
-                wrappers[field] = textwrap.TextWrapper(width=field_size)
+        if total_used <= self.total_width or not rem_fields:
+            for field in rem_fields:
+                wrappers[field] = _text_wrapper(sizes[field])
         else:
             # Assign remainder to REM
             remainder = (
                 self.total_width
                 - whitespace_used
-                - sum(
-                    size
-                    for field, size in sizes.items()
-                    if self.field_fmts[field].width != FieldFormat.REMAINING_SPACE
-                )
+                - sum(size for field, size in sizes.items() if field not in rem_fields)
             )
-            rems = distribute(remainder, n_remaining_cols)
-            for field in sizes:
-                if self.field_fmts[field].width == FieldFormat.REMAINING_SPACE:
-                    width = rems.pop(0)
-                    sizes[field] = width
-                    wrappers[field] = textwrap.TextWrapper(width=width)
-
-        # Wrap REM: Rewrap everything
+            rems = distribute(remainder, len(rem_fields))
+            for field, width in zip(rem_fields, rems):
+                sizes[field] = width
+                wrappers[field] = _text_wrapper(width)
+
+        # sizes contains widths of each column
+        # The escape sequences are worked out once per column, so each cell
+        # costs one ljust and one concatenation.
+        styles = {
+            field: (fmt.prefix, fmt.suffix) for field, fmt in self.field_fmts.items()
+        }
+        # Columns shorter than their row are filled out with blank cells,
+        # so that every line of the row has a whole cell in every column.
+        blanks = {field: " " * width for field, width in sizes.items()}
+        # Build the parts common to every line once
+        left_margin = " " * self.left_margin
+        right_margin = " " * self.right_margin
+        join_cells = (" " * self.padding).join
         for row in wrapped_rows:
-            for field in sizes:
+            # Wrap REM, the only cells left unwrapped
+            for field in rem_fields:
                 cell = row[field]
                 if isinstance(cell, str):
-                    row[field] = wrappers[field].wrap(cell)
-
-        # wrapped_rows is now List[Dict[str, List[str]]]
-        # sizes contains widths of each column
+                    row[field] = self._wrap(wrappers[field], cell)
+            # Left justify each cell, then colorize adding 0-width characters
+            height = max(map(len, row.values()), default=0)
+            columns = []
+            for field, cells in row.items():
+                start, end = styles[field]
+                width = sizes[field]
+                column = [start + cell.ljust(width) + end for cell in cells]
+                column.extend([blanks[field]] * (height - len(cells)))
+                columns.append(column)
+            for line in zip(*columns):
+                yield left_margin + join_cells(line) + right_margin
+
+    def write(
+        self, rows: Iterable[Mapping[str, Any]], file: IO[str], chunk_size: int = 1024
+    ) -> None:
+        """Write the table of *rows* to *file*.
 
-        # Left justify each cell, then colorize adding 0-width characters
-        for row in wrapped_rows:
-            for field in row:
-                fmt = self.field_fmts[field]
-                row[field] = list(
-                    fmt.colorize(cell.ljust(sizes[field]) for cell in row[field])
-                )
+        Lines are joined and written *chunk_size* at a time, rather than
+        with one write per line.
+        """
+        lines = self.tabulate(rows)
+        while chunk := list(itertools.islice(lines, chunk_size)):
+            chunk.append("")
+            file.write("\n".join(chunk))
 
-        line_template = "{left_margin}{cells}{right_margin}"
-        for row in wrapped_rows:
-            for line in itertools.zip_longest(*row.values(), fillvalue=""):
-                # It is necessary to add whitespace to empty lines
-                cells = (
-                    cell.ljust(width)
-                    for width, cell in zip(sizes.values(), line, strict=True)
-                )
-                out = line_template.format(
-                    left_margin=" " * self.left_margin,
-                    cells=(" " * self.padding).join(cells),
-                    right_margin=" " * self.right_margin,
-                )
-                yield out
+    @staticmethod
+    def _wrap(wrapper: textwrap.TextWrapper, text: str) -> list[str]:
+        """Wrap *text* unless it already fits inside *wrapper*'s width."""
+        # Text without tabs, newlines or trailing spaces that fits would come
+        # back from wrap unchanged, so skip the splitting and rejoining.
+        if len(text) <= wrapper.width and text.isprintable() and not text.endswith(" "):
+            return [text]
+        return wrapper.wrap(text)
 
     @staticmethod
     def _rectify_format(val: Any) -> FieldFormat:
@@ -981,6 +1434,15 @@ class Tabulator:
         return val
 
 
+@functools.lru_cache(maxsize=256)
+def _text_wrapper(width: int) -> textwrap.TextWrapper:
+    """Return a ``TextWrapper`` for *width*, shared by all tables.
+
+    A wrapper keeps no state between calls to its wrap method.
+    """
+    return textwrap.TextWrapper(width=width)
+
+
 @dataclasses.dataclass
 class TagCount(Generic[H]):
     tag: H
@@ -1017,14 +1479,20 @@ class SimilarityCalculator(Generic[H]):
 class GenericOverlapTable(Collection[H]):
     """An ``OverlapTable`` that can count any hashable object."""
 
+    __slots__ = ("_n_sets", "_table", "_counter")
+
     # Poor man's version of pandas DataFrame with labels
     #
     # The table matrix is symmetrical: table[i][j] == table[j][i]. Either
     # returns the number of galleries that tags i and j have in common.
+    # The diagonal, the number of galleries each tag is in, is kept apart
+    # in its own counter, so that per-tag counts are read without going
+    # through the rows.
 
     def __init__(self, *sets: Iterable[H]) -> None:
         self._n_sets: int = 0
         self._table: defaultdict[H, Counter[H]] = defaultdict(Counter)
+        self._counter: Counter[H] = Counter()
         self.update(*sets)
 
     def update(self, *sets: Iterable[H]) -> None:
@@ -1032,15 +1500,23 @@ class GenericOverlapTable(Collection[H]):
 
         This is the only method to edit the table.
         """
+        table = self._table
+        counter = self._counter
         for tag_set in sets:
             self._n_sets += 1
-            for tag_x, tag_y in itertools.product(tag_set, repeat=2):
-                self._table[tag_x][tag_y] += 1
+            tags = list(tag_set)
+            for tag in tags:
+                # Count the whole row at once, rather than pair by pair
+                row = table[tag]
+                row.update(tags)
+                counter[tag] += row.pop(tag)
 
     # BINARY METHODS
 
     def get(self, x: H, y: H, /) -> int:
         """Get the number of overlaps between *x* and *y*."""
+        if x == y and x in self._table:
+            return self._counter[x]
         return self._table.get(x, {})[y]
 
     def similarity(self, x: H, y: H, /) -> SimilarityCalculator[H]:
@@ -1059,13 +1535,19 @@ class GenericOverlapTable(Collection[H]):
     def overlaps(self, tag: H) -> Iterator[tuple[H, int]]:
         """
         Yield the tags that *tag* overlaps with and their number of overlaps.
+
+        *tag* itself is yielded first, paired with its own count, followed by
+        the other tags in the order they were first seen together with *tag*.
         """
-        yield from self._table.get(tag, {}).items()
+        if tag in self._table:
+            yield tag, self._counter[tag]
+            yield from self._table[tag].items()
 
     def similarities(self, tag: H) -> Iterator[SimilarityCalculator[H]]:
         tag_a = TagCount(tag, self.count(tag))
+        counter = self._counter
         for other_tag, overlap in self.overlaps(tag):
-            tag_b = TagCount(other_tag, self._table[other_tag][other_tag])
+            tag_b = TagCount(other_tag, counter[other_tag])
             yield SimilarityCalculator(tag_a, tag_b, overlap)
 
     # NULLARY METHODS
@@ -1076,7 +1558,7 @@ class GenericOverlapTable(Collection[H]):
 
     def counter(self) -> Counter[H]:
         """Counter for tags in input sets"""
-        return Counter({tag: counter[tag] for tag, counter in self._table.items()})
+        return self._counter.copy()
 
     def __len__(self) -> int:
         return len(self._table)
@@ -1101,7 +1583,35 @@ class GenericOverlapTable(Collection[H]):
         List the *n* most likely different tag pairs to overlap and their
         number of overlaps. If *n* is None, then list all tag pairs.
         """
-        return most_common(self.pairs_overlaps(), key=operator.itemgetter(1), n=n)
+        # Sort or select only the pairs that do overlap, rather than every
+        # pair. Ties are broken as in pairs_overlaps, by the order of the tags.
+        rank = {tag: i for i, tag in enumerate(self._table)}
+        frequent = most_common(
+            self._nonzero_overlaps(rank),
+            key=lambda item: (item[1], -rank[item[0][0]], -rank[item[0][1]]),
+            n=None if n is None or n < 0 else n,
+        )
+        # Make up the numbers with pairs that never overlap
+        zeros = (((x, y), 0) for x, y in self.pairs() if not self._table[x][y])
+        if n is None or n <= 0:
+            frequent.extend(zeros)
+            return frequent[:n] if n else frequent
+        frequent.extend(itertools.islice(zeros, n - len(frequent)))
+        return frequent
+
+    def _nonzero_overlaps(
+        self, rank: Mapping[H, int]
+    ) -> Iterator[tuple[tuple[H, H], int]]:
+        """Yield ((x, y), table[x][y]) for every pair that overlaps.
+
+        Each pair is ordered so that ``rank[x] < rank[y]``, as the pairs from
+        ``pairs`` are, but the pairs themselves come in no particular order.
+        """
+        for x, row in self._table.items():
+            rank_x = rank[x]
+            for y, overlap in row.items():
+                if overlap and rank_x < rank[y]:
+                    yield (x, y), overlap
 
 
 class OverlapTable(GenericOverlapTable[str]):
@@ -1125,6 +1635,8 @@ class OverlapTable(GenericOverlapTable[str]):
     2
     """
 
+    __slots__ = ()
+
     # METHODS FOR JSON SERIALIZATION
 
     # JSON serialization requires that keys be type str to be round-trip
@@ -1134,17 +1646,81 @@ class OverlapTable(GenericOverlapTable[str]):
         """Convert self's data attributes to an equivalent dictionary.
 
         This form can be easily serialized by ``json.JSONEncoder``.
+        The per-tag counts are written on the diagonal of the table, as they
+        were stored before being split out.
         """
-        return {attr: getattr(self, attr) for attr in ("_n_sets", "_table")}
+        table = {
+            tag: {tag: self._counter[tag], **row} for tag, row in self._table.items()
+        }
+        return {"_n_sets": self._n_sets, "_table": table}
 
     def to_json_string(self, **kwds: Any) -> str:
-        """Serialize the object to a JSON formatted string."""
+        """Serialize the object to a JSON formatted string.
+
+        If :mod:`orjson` is installed, it is used for the keyword arguments
+        where it writes the same output as :func:`json.dumps`: compact
+        ``separators=(",", ":")`` or ``indent=2``, each with
+        ``ensure_ascii=False``.
+        """
+        if (option := self._orjson_option(kwds)) is not None:
+            return orjson.dumps(self._to_dict(), option=option).decode()
         return json.dumps(self._to_dict(), **kwds)
 
     def to_json_stream(self, file: IO[str], **kwds: Any) -> None:
         """Serialize the object as a JSON formatted stream to fp."""
+        if (option := self._orjson_option(kwds)) is not None:
+            file.write(orjson.dumps(self._to_dict(), option=option).decode())
+            return None
         return json.dump(self._to_dict(), file, **kwds)
 
+    def to_json_stream_incremental(
+        self, file: IO[str], buffer_size: int = 64 * 1024
+    ) -> None:
+        """Serialize the object as compact JSON to *file*, one row at a time.
+
+        Unlike :meth:`to_json_stream`, the whole document is never held in
+        memory at once. Output is gathered into chunks of about *buffer_size*
+        characters before each write, and *file* is left with partial output
+        if an error occurs midway.
+        """
+        dumps = self._dumps_compact
+        chunks = [f'{{"_n_sets":{dumps(self._n_sets)},"_table":{{']
+        buffered = len(chunks[0])
+        separator = ""
+        for tag, row in self._table.items():
+            row_json = dumps({tag: self._counter[tag], **row})
+            chunk = f"{separator}{dumps(tag)}:{row_json}"
+            chunks.append(chunk)
+            buffered += len(chunk)
+            separator = ","
+            if buffered >= buffer_size:
+                file.write("".join(chunks))
+                chunks.clear()
+                buffered = 0
+        chunks.append("}}")
+        file.write("".join(chunks))
+
+    @staticmethod
+    def _dumps_compact(obj: Any) -> str:
+        if orjson is not None:
+            return orjson.dumps(obj).decode()
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    @staticmethod
+    def _orjson_option(kwds: Mapping[str, Any]) -> int | None:
+        """Return the :mod:`orjson` option matching *kwds* for :mod:`json`.
+
+        Return None if orjson is not installed or would not write output
+        identical to :func:`json.dumps` called with *kwds*.
+        """
+        if orjson is None:
+            return None
+        if kwds == {"separators": (",", ":"), "ensure_ascii": False}:
+            return 0
+        if kwds == {"indent": 2, "ensure_ascii": False}:
+            return orjson.OPT_INDENT_2
+        return None
+
     @classmethod
     def from_json(cls: type[Table], obj: Mapping) -> Table:
         """
@@ -1154,11 +1730,15 @@ class OverlapTable(GenericOverlapTable[str]):
         new_table = cls()
         new_table._n_sets = obj["_n_sets"]
         for key, counter in obj["_table"].items():
-            new_table._table[key].update(counter)
+            row = new_table._table[key]
+            row.update(counter)
+            new_table._counter[key] += row.pop(key, 0)
         return new_table
 
 
-split_on_whitespace = re.compile(r"\S+").findall
+# str.split and the pattern \S+ agree on what is whitespace, but split
+# runs without the overhead of the regex engine.
+split_on_whitespace: Callable[[str], list[str]] = str.split
 
 
 def distribute(n: int, k: int) -> list[int]:
@@ -1167,12 +1747,8 @@ def distribute(n: int, k: int) -> list[int]:
     >>> distribute(79, 4)
     [20, 20, 20, 19]
     """
-    arr = [n // k for i in range(k)]
-    r = n % k
-    for i in range(r):
-        arr[i] += 1
-    assert sum(arr) == n
-    return arr
+    quotient, remainder = divmod(n, k)
+    return [quotient + 1] * remainder + [quotient] * (k - remainder)
 
 
 def most_common(
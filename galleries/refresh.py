@@ -4,12 +4,14 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import contextlib
 import dataclasses
-import itertools
+import functools
 import logging
 import os
-from collections import ChainMap, defaultdict
+import sys
+from collections import defaultdict, deque
 from collections.abc import (
     Callable,
     Collection,
@@ -48,16 +50,35 @@ class Gardener:
         self._do_count: Callable[[gms.Gallery], None] = lambda *args, **kwds: None
         self._path_field: str = str()
         self._count_field: str = str()
+        self._mtime_field: str | None = None
         self._root_path: Path = Path()
+        self._max_workers: int | None = None
 
     def set_update_count(
-        self, path_field: str, count_field: str, root_path: gms.StrPath | None = None
+        self,
+        path_field: str,
+        count_field: str,
+        root_path: gms.StrPath | None = None,
+        mtime_field: str | None = None,
+        max_workers: int | None = None,
     ) -> None:
+        """Update each gallery's file count.
+
+        If *mtime_field* is given, it stores the folder's modification time
+        as of its last count, and a folder not modified since keeps its count
+        without being listed again.
+        If *max_workers* is greater than 1, folders are listed on a thread
+        pool of that many threads. Otherwise they are listed one at a time.
+        """
         self.needed_fields.update([path_field, count_field])
+        if mtime_field:
+            self.needed_fields.add(mtime_field)
         self._do_count = self._update_count
         self._path_field = path_field
         self._count_field = count_field
+        self._mtime_field = mtime_field or None
         self._root_path = Path(root_path or Path.cwd())
+        self._max_workers = max_workers
 
     def _set_tag_action(
         self, field: str, func: Callable[[gms.TagSet], None] | None = None
@@ -76,24 +97,30 @@ class Gardener:
         self, implications: Collection[gms.BaseImplication], *fields: str
     ) -> None:
         self.needed_fields.update(fields)
+        # Bucket the implications by type once, not once per gallery
+        action = functools.partial(
+            gms.TagSet.apply_implications,
+            implications=gms.ImplicationSet(implications),
+        )
         for field in fields:
-            self._set_tag_action(
-                field, lambda ts: gms.TagSet.apply_implications(ts, implications)
-            )
+            self._set_tag_action(field, action)
 
     def set_remove_tags(self, mask: gms.TagSet, *fields: str) -> None:
         self.needed_fields.update(fields)
+
+        def action(tags: gms.TagSet) -> None:
+            # set.difference_update takes its arguments positionally, so it
+            # cannot be bound with partial as the other actions are
+            tags.difference_update(mask)
+
         for field in fields:
-            self._set_tag_action(
-                field, lambda ts: gms.TagSet.difference_update(ts, mask)
-            )
+            self._set_tag_action(field, action)
 
     def set_alias_tags(self, aliases: Mapping[str, str], *fields: str) -> None:
         self.needed_fields.update(fields)
+        action = functools.partial(gms.TagSet.apply_aliases, aliases=aliases)
         for field in fields:
-            self._set_tag_action(
-                field, lambda ts: gms.TagSet.apply_aliases(ts, aliases)
-            )
+            self._set_tag_action(field, action)
 
     def set_implicator(self, implicator: gms.Implicator, *fields: str) -> None:
         self.needed_fields.update(fields)
@@ -110,32 +137,130 @@ class Gardener:
             for field in self.needed_fields:
                 if field not in fieldnames:
                     raise util.FieldNotFoundError(field)
-        for gallery in reader:
-            self._do_count(gallery)
-            for field, actions in self._tag_fields.items():
+        tag_actions = [
+            (field, action, _memoize_tagstrings(action))
+            for field, action in self._compile_actions()
+        ]
+        do_count = self._do_count
+
+        def garden(gallery: gms.Gallery) -> gms.Gallery:
+            do_count(gallery)
+            for field, action, garden_tagstring in tag_actions:
+                value = gallery[field]
+                if isinstance(value, str):
+                    gallery[field] = gms.TagSet(garden_tagstring(value))
+                    continue
                 tags = gallery.normalize_tags(field)
-                for action in actions:
+                if action is not None:
                     action(tags)
                 gallery[field] = tags
-            yield gallery
+            return gallery
+
+        max_workers = self._max_workers
+        if do_count != self._update_count or max_workers is None or max_workers <= 1:
+            yield from map(garden, reader)
+            return
+        # Counting files means a directory listing per row, and the threads
+        # can wait on those together. Keep a bounded window of rows in flight
+        # and yield them in their original order. Messages logged while
+        # counting may come out of row order.
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        window = 4 * max_workers
+        pending: deque[concurrent.futures.Future[gms.Gallery]] = deque()
+        try:
+            for gallery in reader:
+                pending.append(executor.submit(garden, gallery))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _compile_actions(
+        self,
+    ) -> tuple[tuple[str, Callable[[gms.TagSet], None] | None], ...]:
+        """Freeze each field's tag actions into a single callable for a run.
+
+        Actions still run one after another, in the order they were set, as
+        each may act on the tags left by the one before.
+        """
+        compiled = []
+        for field, actions in self._tag_fields.items():
+            action: Callable[[gms.TagSet], None] | None = None
+            if len(actions) == 1:
+                action = actions[0]
+            elif actions:
+                action = functools.partial(_apply_actions, tuple(actions))
+            compiled.append((field, action))
+        return tuple(compiled)
 
     def _update_count(self, gallery: gms.Gallery) -> None:
         log.info("Checking folder: %s", gallery[self._path_field])
         folder = gallery.get_folder(self._path_field, cwd=self._root_path)
         try:
+            if self._mtime_field is None:
+                gallery.update_count(self._count_field, folder)
+                return
+            # Adding, removing or renaming an entry in a directory changes
+            # its mtime. Stat before listing, so a change made while listing
+            # is caught by the next refresh.
+            mtime = str(os.stat(folder).st_mtime_ns)
+            if gallery.get(self._mtime_field) == mtime and gallery.get(
+                self._count_field
+            ):
+                return
             gallery.update_count(self._count_field, folder)
+            gallery[self._mtime_field] = mtime
         except (FileNotFoundError, NotADirectoryError) as err:
             raise FolderPathError(err) from err
 
 
+def _memoize_tagstrings(
+    action: Callable[[gms.TagSet], None] | None, maxsize: int = 1 << 14
+) -> Callable[[str], frozenset[str]]:
+    """Return a function from a tag string to its tags after *action*.
+
+    Tag actions depend on nothing but the tags they are given, so galleries
+    with the same tag string, such as an empty field, share one result.
+    """
+
+    @functools.lru_cache(maxsize=maxsize)
+    def garden_tagstring(tagstring: str) -> frozenset[str]:
+        tags = gms.TagSet.from_tagstring(tagstring)
+        if action is not None:
+            action(tags)
+        return frozenset(tags)
+
+    return garden_tagstring
+
+
+def _apply_actions(
+    actions: Iterable[Callable[[gms.TagSet], None]], tags: gms.TagSet
+) -> None:
+    for action in actions:
+        action(tags)
+
+
 @dataclasses.dataclass
 class _TagActionsContainer:
     fields: frozenset[str]
-    implications: set[gms.RegularImplication] = dataclasses.field(default_factory=set)
+    # Implications are held as (antecedent, consequent) pairs, which are
+    # cheaper to hash and compare than dataclasses while duplicates are
+    # weeded out.
+    implications: set[tuple[str, str]] = dataclasses.field(default_factory=set)
     aliases: dict[str, str] = dataclasses.field(default_factory=dict)
 
+    def regular_implications(self) -> list[gms.RegularImplication]:
+        return [
+            gms.RegularImplication(antecedent=antecedent, consequent=consequent)
+            for antecedent, consequent in self.implications
+        ]
+
     def to_implicator(self) -> gms.Implicator:
-        return gms.Implicator(implications=self.implications, aliases=self.aliases)
+        return gms.Implicator(
+            implications=self.regular_implications(), aliases=self.aliases
+        )
 
 
 class TagActionsObject:
@@ -154,6 +279,8 @@ class TagActionsObject:
         # A field's spec is the set of pools that apply to a given field
         # For each pair x:P, P is the set of pools that contain field x.
         self._field_spec: defaultdict[str, set[frozenset[str]]] = defaultdict(set)
+        # Implicators already built, by spec; cleared whenever pools change
+        self._implicator_cache: dict[frozenset[frozenset[str]], gms.Implicator] = {}
 
     def read_file(self, filename: os.PathLike, file_format: str | None = None) -> None:
         """Read *filename* and parse tag actions based on its file extension.
@@ -165,7 +292,7 @@ class TagActionsObject:
         """
         path = Path(filename)
         load = util.load_from_json
-        if path.match("*.toml") and file_format != "json":
+        if path.name.endswith(".toml") and file_format != "json":
             load = util.load_from_toml
         log.debug("Loading TagActionsObject from file: %s", filename)
         obj = load(path)
@@ -176,6 +303,7 @@ class TagActionsObject:
         obj = self.extr.dict(obj)
         if not obj:
             return
+        self._implicator_cache.clear()
         dests = self._parse_fields(obj)
         for dest, table_name in dests.items():
             if table_name is None:
@@ -210,24 +338,23 @@ class TagActionsObject:
 
     def _parse_aliases(self, obj: Mapping) -> Iterator[tuple[str, str]]:
         for key, value in self.extr.get_items(obj, "aliases"):
-            yield str(key), str(value)
+            # Many aliases share a tag; let them share one string as well
+            yield sys.intern(str(key)), sys.intern(str(value))
 
-    def _parse_implications(self, obj: Mapping) -> Iterator[gms.RegularImplication]:
+    def _parse_implications(self, obj: Mapping) -> Iterator[tuple[str, str]]:
         yield from self._parse_regulars(obj)
         with self.extr.get_dict(obj, "descriptors") as table:
             yield from self._parse_descriptors(table)
 
-    def _parse_regulars(self, obj: Mapping) -> Iterator[gms.RegularImplication]:
+    def _parse_regulars(self, obj: Mapping) -> Iterator[tuple[str, str]]:
         for key, value in self.extr.get_items(obj, "implications"):
-            yield gms.RegularImplication(antecedent=str(key), consequent=str(value))
+            yield sys.intern(str(key)), sys.intern(str(value))
         for key, value in self.extr.get_items(obj, "multi-implications"):
-            antecedent = str(key)
+            antecedent = sys.intern(str(key))
             for consequent in self.extr.list(value):
-                yield gms.RegularImplication(
-                    antecedent=antecedent, consequent=str(consequent)
-                )
+                yield antecedent, sys.intern(str(consequent))
 
-    def _parse_descriptors(self, table: Mapping) -> Iterator[gms.RegularImplication]:
+    def _parse_descriptors(self, table: Mapping) -> Iterator[tuple[str, str]]:
         symbols: WordMultiplier = WordMultiplier()
         for name, words in self.extr.get_items(table, "sets"):
             symbols.add_set(name, self.extr.list(words))
@@ -245,22 +372,30 @@ class TagActionsObject:
                 self.extr.warn("Chain has fewer than two names in it: %s", name)
                 continue
             try:
-                yield from symbols.implications_from_chain(chain)
+                yield from symbols.chain(chain, join=symbols.join)
             except KeyError as err:
                 self.extr.warn("Bad set/union name: %s", err)
 
     def _make_implicator(self, spec: AbstractSet[frozenset[str]]) -> gms.Implicator:
+        key = frozenset(spec)
+        if (cached := self._implicator_cache.get(key)) is not None:
+            return cached
         implic = gms.Implicator()
         alias_maps: list[dict[str, str]] = []
         for pool in spec:
             data = self._pools[pool]
             if data.aliases:
                 alias_maps.append(data.aliases)
-            for impl in data.implications:
-                implic.add(impl)
-        # Put the larger maps first in the lookup sequence.
+            implic.add_many(data.regular_implications())
+        # Merge into one dict, so that each lookup is a single hash probe.
+        # Where maps disagree the larger map wins, as it did when the maps
+        # were chained with the larger maps first.
         alias_maps.sort(key=len)
-        implic.aliases = ChainMap(*alias_maps)
+        merged: dict[str, str] = {}
+        for aliases in alias_maps:
+            merged.update(aliases)
+        implic.aliases = merged
+        self._implicator_cache[key] = implic
         return implic
 
     def get_implicator(self, fieldname: str | None = None) -> gms.Implicator:
@@ -315,41 +450,29 @@ class WordMultiplier(Generic[Symbol]):
 
     def add_union(self, union_name: Symbol, *sets: Symbol) -> None:
         """Map the union of sets with names *sets* to *union_name*."""
-        union_set = (self.symbols[name] for name in sets)
-        self.symbols[union_name] = frozenset(itertools.chain(*union_set))
+        union_set = [self.symbols[name] for name in sets]
+        self.symbols[union_name] = frozenset().union(*union_set)
 
     def chain(
         self, names: Sequence[Symbol], join: Callable[[Iterable[str]], T] = tuple
     ) -> Iterator[tuple[T, T]]:
         descriptors = [self.symbols[name] for name in reversed(names)]
-        for consequent, antecedent in set_chains(*descriptors):
-            yield join(reversed(antecedent)), join(reversed(consequent))
-
-    def implications_from_chain(
-        self, names: Sequence[Symbol]
-    ) -> Iterator[gms.RegularImplication]:
-        """Yield implications from sets referred to by *names*.
-
-        For a chain of two sets A and B, yield ab -> b for each word in each
-        set. With a third set C, yield abc -> bc and bc -> c. And so on.
-        """
-        for antecedent, consequent in self.chain(names, join=self.join):
-            yield gms.RegularImplication(antecedent=antecedent, consequent=consequent)
-
-
-def set_chains(
-    *word_sets: Iterable[str],
-) -> Iterator[tuple[tuple[str, ...], tuple[str, ...]]]:
-    """
-    For each n-tuple in the product of n iterables *word_sets*, yield pairs
-    ((a,),(a,b)), ((a,b),(a,b,c)), ((a,b,c),(a,b,c,d)), and so on, up to n.
-    """
-    for group in itertools.product(*word_sets):
-        result_stack = [group[0]]
-        for elem in group[1:]:
-            consequent = tuple(result_stack)
-            result_stack.append(elem)
-            yield consequent, tuple(result_stack)
+        if not descriptors or not all(descriptors):
+            # With no sets, or an empty one, there are no compounds
+            return
+        # Grow the compounds one set at a time, from the last name backwards,
+        # so that each compound is joined once and each pair is yielded once,
+        # rather than once for every combination of the words before it
+        compounds = [((word,), join((word,))) for word in descriptors[0]]
+        for words in descriptors[1:]:
+            longer = []
+            for suffix, consequent in compounds:
+                for word in words:
+                    group = (word, *suffix)
+                    antecedent = join(group)
+                    yield antecedent, consequent
+                    longer.append((group, antecedent))
+            compounds = longer
 
 
 def check_mapping(obj: object, default: type[Mapping] = dict) -> Mapping:
@@ -365,14 +488,16 @@ def check_mapping(obj: object, default: type[Mapping] = dict) -> Mapping:
 
 def get_implications(filename: os.PathLike) -> frozenset[gms.BaseImplication]:
     """Read *filename* and parse implications based on its file extension."""
-    extensions = ("dat", "txt", "asc", "list")
+    extensions = (".dat", ".txt", ".asc", ".list")
     path = Path(filename)
-    if path.match("*.json"):
+    # Test the end of the name directly; Path.match would translate and
+    # compile a glob pattern for each extension
+    if path.name.endswith(".json"):
         data = check_mapping(util.load_from_json(path))
         return frozenset(
             gms.RegularImplication(str(k), str(v)) for k, v in data.items()
         )
-    if any(path.match(f"*.{ext}") for ext in extensions):
+    if path.name.endswith(extensions):
         text = path.read_text(encoding="utf-8")
         return frozenset(
             gms.DescriptorImplication(desc) for desc in gms.split_on_whitespace(text)
@@ -386,7 +511,7 @@ def get_implications(filename: os.PathLike) -> frozenset[gms.BaseImplication]:
 
 def get_aliases(filename: os.PathLike) -> dict[str, str]:
     data = check_mapping(util.load_from_json(filename))
-    return {str(alias): str(tag) for alias, tag in data.items()}
+    return {sys.intern(str(alias)): sys.intern(str(tag)) for alias, tag in data.items()}
 
 
 def get_tags_from_file(*filepaths: os.PathLike) -> gms.TagSet:
@@ -397,7 +522,8 @@ def get_tags_from_file(*filepaths: os.PathLike) -> gms.TagSet:
     tags = gms.TagSet()
     for path in filepaths:
         text = Path(path).read_text(encoding="utf-8")
-        tags.update(gms.TagSet.from_tagstring(text))
+        # The same as TagSet.from_tagstring, without a TagSet per file
+        tags.update(map(sys.intern, gms.split_on_whitespace(text.lower())))
     return tags
 
 
@@ -445,6 +571,53 @@ def validate_tag_actions(implicator: gms.Implicator) -> int:
     return errors
 
 
+# Where the platform allows it, open each directory relative to its parent's
+# file descriptor, so the kernel resolves one path component per directory
+# instead of the whole path from the root every time. Elsewhere, a directory
+# is referred to by its path.
+_WALK_DIR_FDS = (
+    os.open in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+    and hasattr(os, "O_DIRECTORY")
+)
+_DirRef = int | str
+
+
+def _open_dir(name: gms.StrPath, parent: _DirRef | None = None) -> _DirRef:
+    if not _WALK_DIR_FDS:
+        return os.path.join(parent or "", name)
+    flags = os.O_RDONLY | os.O_DIRECTORY
+    if parent is not None:
+        # Don't let a child swapped for a symlink lead outside the tree
+        flags |= getattr(os, "O_NOFOLLOW", 0)
+    return os.open(name, flags, dir_fd=parent)
+
+
+def _close_dir(dir_ref: _DirRef) -> None:
+    if isinstance(dir_ref, int):
+        os.close(dir_ref)
+
+
+def _scan_dir(dir_ref: _DirRef) -> tuple[int, list[str]]:
+    """Return count of non-hidden entries in a directory and its child
+    directories' names.
+    """
+    total_count: int = 0
+    child_names: list[str] = []
+    # DirEntry.is_dir answers from the directory listing itself, without a
+    # stat call per entry
+    with os.scandir(dir_ref) as scandir_it:
+        for entry in scandir_it:
+            name = entry.name
+            # A directory entry's name is never empty, and indexing skips the
+            # method call of str.startswith
+            if name[0] != ".":
+                total_count += 1
+                if entry.is_dir(follow_symlinks=False):
+                    child_names.append(name)
+    return total_count, child_names
+
+
 def traverse_fs(root: Path, *, leaves_only: bool = False) -> Iterator[tuple[Path, int]]:
     """Yield descendant directories of *root* and their file counts.
 
@@ -453,23 +626,45 @@ def traverse_fs(root: Path, *, leaves_only: bool = False) -> Iterator[tuple[Path
     If *leaves_only* is True (default is False), only yield directories that
     have no child directories of their own.
     """
-    total_count: int = 0
-    child_nodes: list[Path] = []
+    # Walk depth-first with an explicit stack, yielding directories in the
+    # same order as recursing into each child in turn would. Each frame holds
+    # its directory open until all of its children have been entered. Paths
+    # are kept as strings, and a Path is made only for a directory yielded.
+    stack: list[tuple[str, _DirRef, Iterator[str]]] = []
+
+    def enter(node: str, name: gms.StrPath, parent: _DirRef | None) -> int:
+        try:
+            dir_ref = _open_dir(name, parent)
+        except OSError as err:
+            log.info("Cannot get contents of directory: %s: %s", node, err.strerror)
+            return 0
+        try:
+            total_count, child_names = _scan_dir(dir_ref)
+        except OSError as err:
+            _close_dir(dir_ref)
+            log.info("Cannot get contents of directory: %s: %s", node, err.strerror)
+            return 0
+        stack.append((node, dir_ref, iter(child_names)))
+        if leaves_only and child_names:
+            return 0
+        return total_count - len(child_names)
+
     try:
-        for path in root.iterdir():
-            if not path.name.startswith("."):
-                total_count += 1
-                if path.is_dir() and not path.is_symlink():
-                    child_nodes.append(path)
-    except OSError as err:
-        log.info("Cannot get contents of directory: %s", err)
-        return
-    if not leaves_only or not child_nodes:
-        file_count = total_count - len(child_nodes)
-        if file_count > 0:
+        if file_count := enter(os.fspath(root), root, None):
             yield root, file_count
-    for child in child_nodes:
-        yield from traverse_fs(child, leaves_only=leaves_only)
+        while stack:
+            node, dir_ref, child_names = stack[-1]
+            name = next(child_names, None)
+            if name is None:
+                stack.pop()
+                _close_dir(dir_ref)
+                continue
+            child = os.path.join(node, name)
+            if file_count := enter(child, name, dir_ref):
+                yield Path(child), file_count
+    finally:
+        for _, dir_ref, _ in stack:
+            _close_dir(dir_ref)
 
 
 def traverse_main(
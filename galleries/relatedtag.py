@@ -10,7 +10,7 @@ import logging
 import math
 import operator
 import sys
-from collections.abc import Collection, Iterable, Mapping, MutableMapping
+from collections.abc import Callable, Collection, Iterable, Mapping, MutableMapping
 from typing import IO, Any
 
 from . import PROG
@@ -60,8 +60,7 @@ class ResultsTable:
                 if format_spec := self.formats.get(key):
                     row[key] = format(row[key], format_spec)
             rows.append(row)
-        for line in self.tabulator.tabulate(rows):
-            print(line, file=self.file)
+        self.tabulator.write(rows, self.file)
 
     def write_blank(self) -> None:
         print(file=self.file)
@@ -104,13 +103,25 @@ def make_row(sim: SimilarityCalculator[str]) -> SimilarityResult:
     )
 
 
+# Compute only the field being sorted by, for each candidate row
+_SORT_KEYS: dict[str, Callable[[SimilarityCalculator[str]], Any]] = {
+    "tag": operator.attrgetter("tag_b.tag"),
+    "count": operator.attrgetter("tag_b.count"),
+    "cosine": SimilarityCalculator.cosine_similarity,
+    "jaccard": SimilarityCalculator.jaccard_index,
+    "overlap": SimilarityCalculator.overlap_coefficient,
+    "frequency": SimilarityCalculator.frequency,
+}
+
+
 def sort(
     calculators: Iterable[SimilarityCalculator[str]],
     sort_by: str,
     n: int | None = None,
 ) -> list[SimilarityResult]:
-    result_rows = (make_row(sim) for sim in calculators)
-    return most_common(result_rows, n=n, key=operator.attrgetter(sort_by))
+    # Only the rows that make the cut have all their metrics computed.
+    top = most_common(calculators, n=n, key=_SORT_KEYS[sort_by])
+    return [make_row(sim) for sim in top]
 
 
 def query(
@@ -230,8 +230,7 @@ def print_formatted(
     """Write *rows* to *file* in wrapped columns."""
     max_width = shutil.get_terminal_size().columns
     tabulator = gms.Tabulator(field_formats, total_width=max_width, right_margin=0)
-    for line in tabulator.tabulate(rows):
-        print(line, file=file)
+    tabulator.write(rows, file)
 
 
 def parse_field_format_file(filename: gms.StrPath) -> dict[str, gms.FieldFormat]:
@@ -6,23 +6,25 @@ from __future__ import annotations
 
 import contextlib
 import csv
+import functools
 import json
 import logging
 import os
 import re
 import sys
 from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
-from typing import Any, TypeVar
+from types import ModuleType
+from typing import Any, Generic, TypeVar
 
 import rich.console
 
 from . import PROG
 from .galleryms import Gallery
 
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    import tomli as tomllib
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 log = logging.getLogger(PROG)
 
@@ -70,18 +72,15 @@ class ObjectExtractor:
                 yield key, value
                 self._parse_stack.pop()
 
-    @contextlib.contextmanager
-    def get(self, mapping: Mapping[KT, VT], key: KT, default: VT) -> Iterator[VT]:
-        self._parse_stack.append(str(key))
+    def get(self, mapping: Mapping[KT, VT], key: KT, default: VT) -> _KeyContext[VT]:
+        return _KeyContext(self, mapping, key, default)
+
+    def _lookup(self, mapping: Mapping[KT, VT], key: KT, default: VT) -> VT:
         try:
-            value = mapping.get(key, default)
+            return mapping.get(key, default)
         except AttributeError:
             self.warn("Expected a mapping got a %s", type(mapping))
-            yield default
-        else:
-            yield value
-        finally:
-            self._parse_stack.pop()
+            return default
 
     def object(self, value: object, class_or_type: type[T]) -> T:
         if isinstance(value, class_or_type):
@@ -103,10 +102,8 @@ class ObjectExtractor:
         with self.get(mapping, key, default=[]) as value:
             return self.list(value)
 
-    @contextlib.contextmanager
-    def get_dict(self, mapping: Mapping[KT, dict], key: KT) -> Iterator[dict]:
-        with self.get(mapping, key, default={}) as value:
-            yield self.dict(value)
+    def get_dict(self, mapping: Mapping[KT, dict], key: KT) -> _KeyContext[dict]:
+        return _KeyContext(self, mapping, key, {}, convert=self.dict)
 
     def get_items(
         self, mapping: Mapping[KT, Mapping[T, VT]], key: KT
@@ -120,6 +117,46 @@ class ObjectExtractor:
         )
 
 
+_BARE_KEY_RE = re.compile("[A-Za-z0-9_-]+")
+
+
+class _KeyContext(Generic[VT]):
+    """Look up *key* in *mapping* with *key* pushed on the parse stack.
+
+    A plain class rather than a ``contextlib.contextmanager``, so that each
+    key looked up costs one small object instead of a generator and its
+    wrapper. If given, *convert* is applied to the value while *key* is still
+    on the stack, so that any warning it emits includes *key*.
+    """
+
+    __slots__ = ("_extr", "_mapping", "_key", "_default", "_convert")
+
+    def __init__(
+        self,
+        extr: ObjectExtractor,
+        mapping: Mapping[Any, Any],
+        key: object,
+        default: Any,
+        convert: Callable[[Any], VT] | None = None,
+    ) -> None:
+        self._extr = extr
+        self._mapping = mapping
+        self._key = key
+        self._default = default
+        self._convert = convert
+
+    def __enter__(self) -> VT:
+        extr = self._extr
+        extr._parse_stack.append(str(self._key))
+        value = extr._lookup(self._mapping, self._key, self._default)
+        if self._convert is not None:
+            return self._convert(value)
+        return value
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._extr._parse_stack.pop()
+
+
 def toml_address(keys: Iterable[str | None]) -> str:
     """Quote *keys* according to TOML rules and join by periods.
 
@@ -128,12 +165,11 @@ def toml_address(keys: Iterable[str | None]) -> str:
     >>> toml_address([None, "bare", "two words", "bang!"])
     'bare."two words"."bang!"'
     """
-    bare_chars = "[A-Za-z0-9_-]+"
     quoted = []
     for key in keys:
         if not key:
             continue
-        if re.fullmatch(bare_chars, key):
+        if _BARE_KEY_RE.fullmatch(key):
             quoted.append(key)
         else:
             quoted.append(f'"{key}"')
@@ -207,6 +243,9 @@ class StrictReader(csv.DictReader):
         return Gallery(zip(self.fieldnames, row, strict=True))
 
 
+_READ_BUFFER_SIZE = 1 << 20
+
+
 @contextlib.contextmanager
 def read_db(
     file: os.PathLike | None = None, fieldnames: Iterable[str] | None = None
@@ -219,7 +258,8 @@ def read_db(
     if file is None or file == sys.stdin:
         file_cm = contextlib.nullcontext(sys.stdin)
     else:
-        file_cm = open(file, encoding="utf-8", newline="")
+        # Fill the buffer in large reads, rather than a block at a time
+        file_cm = open(file, encoding="utf-8", newline="", buffering=_READ_BUFFER_SIZE)
     with file_cm as infile:
         reader = Reader(StrictReader(infile))
         if reader.fieldnames:
@@ -248,10 +288,35 @@ def write_galleries(
         writer.writerows(rows)
 
 
+def parse_tag_fields(
+    rows: Iterable[Gallery], fields: Iterable[str]
+) -> Iterator[Gallery]:
+    """Yield *rows* with the values of *fields* replaced by their ``TagSet``s.
+
+    Later reads of those fields, by a query and then by the caller, will not
+    have to parse the tag string again.
+    """
+    fields = tuple(fields)
+    for gallery in rows:
+        for field in fields:
+            gallery[field] = gallery.normalize_tags(field)
+        yield gallery
+
+
+@functools.cache
+def _import_tomllib() -> ModuleType:
+    if sys.version_info >= (3, 11):
+        import tomllib  # pylint: disable=import-outside-toplevel
+    else:
+        import tomli as tomllib  # pylint: disable=import-outside-toplevel
+    return tomllib
+
+
 def load_from_toml(filename: os.PathLike) -> dict[str, Any]:
     """
     Do not attempt :mod:`tomllib` import until this function is called.
     """
+    tomllib = _import_tomllib()
     with open(filename, "rb") as file:
         try:
             return tomllib.load(file)
@@ -261,12 +326,22 @@ def load_from_toml(filename: os.PathLike) -> dict[str, Any]:
 
 
 def load_from_json(filename: os.PathLike) -> Any:
+    """
+    Use :mod:`orjson` to parse the file's bytes if it is installed. Input that
+    orjson rejects (a byte order mark, UTF-16, NaN) is retried with :mod:`json`.
+    """
     with open(filename, "rb") as file:
-        try:
-            return json.load(file)
-        except json.JSONDecodeError as err:
-            log.error("Unable to decode file as JSON: In %s: %s", filename, err)
-            return {}
+        data = file.read()
+    try:
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
+    except json.JSONDecodeError as err:
+        log.error("Unable to decode file as JSON: In %s: %s", filename, err)
+        return {}
 
 
 # SORTING FUNCTIONS
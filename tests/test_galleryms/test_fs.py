@@ -50,6 +50,12 @@ class TestGallery:
             gallery.check_folder("Path", cwd=tmp_path)
         assert tmp_path / self._FOLDER_NAME in raises_ctx.value.args
 
+    def test_check_symlink_loop(self, gallery, tmp_path):
+        tmp_path.joinpath(self._FOLDER_NAME).symlink_to(self._FOLDER_NAME)
+        with pytest.raises(FileNotFoundError) as raises_ctx:
+            gallery.check_folder("Path", cwd=tmp_path)
+        assert tmp_path / self._FOLDER_NAME in raises_ctx.value.args
+
     def test_check_non_folder(self, gallery, tmp_path):
         tmp_path.joinpath(self._FOLDER_NAME).touch()
         with pytest.raises(NotADirectoryError) as raises_ctx:
@@ -92,3 +98,14 @@ class TestOverlapTableFileSystem(TestOverlapTable):
             obj = json.load(f)
         table1 = galleries.galleryms.OverlapTable.from_json(obj)
         assert self._tables_equal(table0, table1)
+
+    @pytest.mark.parametrize("buffer_size", [1, 64 * 1024])
+    def test_roundtrip_json_stream_incremental(self, tmp_path, buffer_size):
+        table0 = galleries.galleryms.OverlapTable(*TAG_SETS)
+        with open(tmp_path / "serialized_table.json", "w", encoding="utf-8") as f:
+            table0.to_json_stream_incremental(f, buffer_size=buffer_size)
+        with open(tmp_path / "serialized_table.json", "rb") as f:
+            obj = json.load(f)
+        assert obj == json.loads(table0.to_json_string())
+        table1 = galleries.galleryms.OverlapTable.from_json(obj)
+        assert self._tables_equal(table0, table1)
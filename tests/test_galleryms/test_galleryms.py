@@ -1,5 +1,6 @@
 """Unit tests for galleryms"""
 
+import fnmatch
 import itertools
 import json
 import operator
@@ -60,6 +61,26 @@ class TestImplicationGraph(unittest.TestCase):
         # Cycle in the middle of the graph
         self._assert_cycle({1: {2}, 2: {3}, 3: {2, 4}, 4: {5}}, [2, 3, 2])
 
+    def test_deep_graph(self):
+        # Deeper than the default recursion limit
+        depth = 5000
+        chain = {i: {i + 1} for i in range(depth)}
+        self._assert_cycle(chain, None)
+        ig = self._make(chain)
+        test_set = galleries.galleryms.TagSet()
+        ig.join_descendants(test_set, 0)
+        self.assertEqual(len(test_set), depth + 1)
+        chain[depth] = {depth // 2}
+        self._assert_cycle(chain, [*range(depth // 2, depth + 1), depth // 2])
+
+    def test_reading_does_not_add_nodes(self):
+        graph = {"1": {"2"}, "2": {"3"}, "4": {"1"}}
+        ig = self._make(graph)
+        self.assertIsNone(ig.find_cycle())
+        ig.join_descendants(galleries.galleryms.TagSet(), "4")
+        self.assertEqual(sorted(ig.descendants_of("4")), ["1", "2", "3"])
+        self.assertEqual(ig.graph, graph)
+
 
 class TestImplicator(unittest.TestCase):
     def test_aliased_implication(self):
@@ -85,6 +106,35 @@ class TestImplicator(unittest.TestCase):
             [("d", "a", "c")],
         )
 
+    def test_implicate_after_add(self):
+        implicator = galleries.galleryms.Implicator(
+            [galleries.galleryms.RegularImplication("car", "vehicle")],
+            aliases={"auto": "car"},
+        )
+        tag_set = galleries.galleryms.TagSet({"auto", "red"})
+        implicator.implicate(tag_set)
+        self.assertEqual(tag_set, {"car", "vehicle", "red"})
+        # Descendants remembered from the first call must not go stale
+        implicator.add(galleries.galleryms.RegularImplication("vehicle", "thing"))
+        tag_set = galleries.galleryms.TagSet({"auto"})
+        implicator.implicate(tag_set)
+        self.assertEqual(tag_set, {"car", "vehicle", "thing"})
+
+    def test_add_many(self):
+        implications = [
+            galleries.galleryms.RegularImplication("car", "vehicle"),
+            galleries.galleryms.RegularImplication("vehicle", "thing"),
+        ]
+        implicator = galleries.galleryms.Implicator(iter(implications))
+        self.assertEqual(implicator.implications, set(implications))
+        tag_set = galleries.galleryms.TagSet({"car"})
+        implicator.implicate(tag_set)
+        self.assertEqual(tag_set, {"car", "vehicle", "thing"})
+        implicator.add_many([galleries.galleryms.RegularImplication("thing", "it")])
+        tag_set = galleries.galleryms.TagSet({"car"})
+        implicator.implicate(tag_set)
+        self.assertEqual(tag_set, {"car", "vehicle", "thing", "it"})
+
 
 class TestGallery(unittest.TestCase):
     def test_merge_tags(self):
@@ -131,6 +181,19 @@ class TestSearchTerm(unittest.TestCase):
         # gallery_2 does not match
         self.assertIs(term.match(gallery_2), None)
 
+    def test_wildcard_shapes(self):
+        tags = ["", "a", "ab", "ba", "aba", "a_b", "bab"]
+        for word in ["a", "a*", "*a", "a*a", "*a*", "*", "**", "a*b*", "?a", "[ab]"]:
+            term = galleries.galleryms.WildcardSearchTerm(word, "Tags")
+            for tag in tags:
+                with self.subTest(word=word, tag=tag):
+                    gallery = galleries.galleryms.Gallery(
+                        Tags=galleries.galleryms.TagSet({tag})
+                    )
+                    self.assertEqual(
+                        bool(term.match(gallery)), fnmatch.fnmatchcase(tag, word)
+                    )
+
     @staticmethod
     def basic_term():
         """Basic search term with one field argument"""
@@ -163,6 +226,24 @@ class TestSearchTerm(unittest.TestCase):
         invalid_gallery = galleries.galleryms.Gallery(area="alphanum")
         self.assertFalse(term.match(invalid_gallery))
 
+    def test_shared_cache(self):
+        gallery = galleries.galleryms.Gallery(count="3", tags="a b c")
+        cache = {}
+        numeric = galleries.galleryms.NumericCondition(operator.eq, 3, "count")
+        cardinality = galleries.galleryms.CardinalityCondition(operator.eq, 3, "count")
+        tag_term = galleries.galleryms.WholeSearchTerm("a", "tags")
+        self.assertTrue(numeric.match(gallery, cache))
+        self.assertTrue(tag_term.match(gallery, cache))
+        # Field values parsed to different types are cached separately
+        self.assertFalse(cardinality.match(gallery, cache))
+        self.assertEqual(cache[(float, "count")], 3.0)
+        self.assertEqual(cache[(galleries.galleryms.TagSet, "tags")], {"a", "b", "c"})
+        # Later terms reuse the parsed values rather than the gallery
+        gallery["count"] = "4"
+        gallery["tags"] = "d"
+        self.assertTrue(numeric.match(gallery, cache))
+        self.assertTrue(tag_term.match(gallery, cache))
+
 
 class TestQuery(unittest.TestCase):
     def test_truthiness(self):
@@ -178,6 +259,86 @@ class TestQuery(unittest.TestCase):
         query = galleries.galleryms.Query(conjuncts=[term], negations=[term])
         self.assertEqual(list(query.all_terms()), [term, term])
 
+    def test_match_after_change(self):
+        query = galleries.galleryms.Query(
+            [galleries.galleryms.WholeSearchTerm("a", ["Tags"])]
+        )
+        gallery = galleries.galleryms.Gallery(Tags="a")
+        self.assertTrue(query.match(gallery))
+        query.negations.append(galleries.galleryms.WholeSearchTerm("a", ["Tags"]))
+        self.assertFalse(query.match(gallery))
+
+    def test_compile(self):
+        calls = []
+
+        class CountingTerm(galleries.galleryms.WholeSearchTerm):
+            def match(self, gallery, cache=None):
+                calls.append(self.word)
+                return super().match(gallery, cache)
+
+        query = galleries.galleryms.Query(
+            conjuncts=[CountingTerm("a", "Tags"), CountingTerm("b", "Tags")],
+            disjuncts=[CountingTerm("c", "Tags"), CountingTerm("d", "Tags")],
+        )
+        matcher = query.compile()
+        self.assertFalse(matcher(galleries.galleryms.Gallery(Tags="b c")))
+        self.assertEqual(calls, ["a"])
+        calls.clear()
+        self.assertTrue(matcher(galleries.galleryms.Gallery(Tags="a b c")))
+        self.assertEqual(calls, ["a", "b", "c"])
+        empty_matcher = galleries.galleryms.Query().compile()
+        self.assertTrue(empty_matcher(galleries.galleryms.Gallery()))
+
+    def test_compile_whole_terms(self):
+        def wholes(*words):
+            return [galleries.galleryms.WholeSearchTerm(w, ["F", "G"]) for w in words]
+
+        query = galleries.galleryms.Query(
+            conjuncts=wholes("a", "b"), negations=wholes("x", "y")
+        )
+        matcher = query.compile()
+        for values, expected in [
+            (("a b", ""), True),
+            (("a", "b c"), True),
+            (("a", "c"), False),
+            (("a b", "y"), False),
+            (("", ""), False),
+        ]:
+            with self.subTest(values=values):
+                gallery = galleries.galleryms.Gallery(zip("FG", values))
+                self.assertIs(matcher(gallery), expected)
+
+    def test_compile_wildcards(self):
+        def wildcards(*words):
+            return [galleries.galleryms.WildcardSearchTerm(w, "Tags") for w in words]
+
+        query = galleries.galleryms.Query(
+            negations=wildcards("x*", "*y"), disjuncts=wildcards("a*", "*b", "c")
+        )
+        matcher = query.compile()
+        for tags, expected in [
+            ("ab", True),
+            ("cb", True),
+            ("c", True),
+            ("ca", False),
+            ("ab ay", False),
+            ("ab xz", False),
+        ]:
+            with self.subTest(tags=tags):
+                gallery = galleries.galleryms.Gallery(Tags=tags)
+                self.assertIs(matcher(gallery), expected)
+
+
+class TestArgumentParser(unittest.TestCase):
+    def test_operator_config(self):
+        class BangParser(galleries.galleryms.ArgumentParser):
+            not_operator = "!"
+
+        query = BangParser(["Tags"]).parse_args(["!tok1"])
+        self.assertEqual(len(query.negations), 1)
+        with self.assertRaises(galleries.galleryms.ArgumentParsingError):
+            galleries.galleryms.ArgumentParser(["Tags"]).parse_args(["!tok1"])
+
 
 class TestSimilarityCalculator(unittest.TestCase):
     TYPICAL_COUNTS = (
@@ -270,6 +431,19 @@ class TestOverlapTableNoFS(unittest.TestCase, TestOverlapTable):
         self.assertEqual(len(sorted_overlaps), 6)
         self.assertEqual(sorted_overlaps[:2], frequent_overlaps)
 
+    def test_frequent_overlaps_n(self):
+        table = galleries.galleryms.OverlapTable(*TAG_SETS)
+        sorted_overlaps = table.frequent_overlaps()
+        self.assertEqual(
+            sorted_overlaps,
+            sorted(table.pairs_overlaps(), key=lambda item: item[1], reverse=True),
+        )
+        # Including n where zero overlaps must be used to make up the numbers
+        for n in range(-len(sorted_overlaps) - 1, len(sorted_overlaps) + 2):
+            with self.subTest(n=n):
+                expected = sorted_overlaps[:n] if n else sorted_overlaps
+                self.assertEqual(table.frequent_overlaps(n), expected)
+
     def test_similarities(self):
         table = self._make_nontrivial()
         expected_overlap_results = {"a": 1, "b": 3, "c": 2, "d": 2}
@@ -293,6 +467,30 @@ class TestOverlapTableNoFS(unittest.TestCase, TestOverlapTable):
                 json_obj = json.loads(json_string)
                 table1 = galleries.galleryms.OverlapTable.from_json(json_obj)
                 self.assertTrue(self._tables_equal(table0, table1))
+                self.assertEqual(table0.counter(), table1.counter())
+
+    def test_json_format(self):
+        # Per-tag counts are serialized on the diagonal of the table
+        obj = {"_n_sets": 2, "_table": {"a": {"a": 2, "b": 1}, "b": {"a": 1, "b": 1}}}
+        table = galleries.galleryms.OverlapTable.from_json(obj)
+        self.assertEqual(table.count("a"), 2)
+        self.assertEqual(table.get("a", "b"), 1)
+        self.assertEqual(json.loads(table.to_json_string()), obj)
+        self.assertEqual(json.loads(table.to_json_string(indent=2)), obj)
+
+    def test_json_string_matches_json_dumps(self):
+        obj = {"_n_sets": 2, "_table": {"a": {"a": 2, "b": 1}, "b": {"b": 1, "a": 1}}}
+        table = galleries.galleryms.OverlapTable.from_json(obj)
+        self.assertEqual(table.to_json_string(), json.dumps(obj))
+        compact = {"separators": (",", ":"), "ensure_ascii": False}
+        self.assertEqual(table.to_json_string(**compact), json.dumps(obj, **compact))
+
+    def test_json_string_non_ascii(self):
+        obj = {"_n_sets": 1, "_table": {"café": {"café": 1, "naïve": 1}}}
+        table = galleries.galleryms.OverlapTable.from_json(obj)
+        for kwds in [{"indent": 2}, {"indent": 2, "ensure_ascii": False}]:
+            with self.subTest(kwds=kwds):
+                self.assertEqual(table.to_json_string(**kwds), json.dumps(obj, **kwds))
 
 
 class TestTagSet(unittest.TestCase):
@@ -309,6 +507,78 @@ class TestTagSet(unittest.TestCase):
         tag_set.apply_aliases(aliases)
         self.assertEqual(tag_set, {"Rome", "New York", "Tenochtitlan"})
 
+    def test_apply_aliases_one_step(self):
+        # Transitive aliases are only followed one step, regardless of order
+        for aliases in ({"a": "b", "b": "c"}, {"b": "c", "a": "b"}):
+            with self.subTest(aliases=aliases):
+                tag_set = galleries.galleryms.TagSet({"a", "d"})
+                tag_set.apply_aliases(aliases)
+                self.assertEqual(tag_set, {"b", "d"})
+
+    def test_apply_implications_cycle(self):
+        implications = [
+            galleries.galleryms.RegularImplication("a", "b"),
+            galleries.galleryms.RegularImplication("b", "c"),
+            galleries.galleryms.RegularImplication("c", "a"),
+        ]
+        tag_set = galleries.galleryms.TagSet({"b"})
+        tag_set.apply_implications(implications)
+        self.assertEqual(tag_set, {"a", "b", "c"})
+
+    def test_implication_set(self):
+        implications = galleries.galleryms.ImplicationSet(
+            [
+                galleries.galleryms.RegularImplication("shirt", "clothing"),
+                galleries.galleryms.RegularImplication("shirt", "top"),
+                galleries.galleryms.DescriptorImplication("red"),
+            ]
+        )
+        self.assertEqual(len(implications), 3)
+        self.assertEqual(implications.regular, {"shirt": ["clothing", "top"]})
+        tag_set = galleries.galleryms.TagSet({"red_shirt", "red_hat"})
+        tag_set.apply_implications(implications)
+        self.assertEqual(
+            tag_set, {"red_shirt", "red_hat", "shirt", "hat", "clothing", "top"}
+        )
+
+    def test_implication_set_closure(self):
+        implications = galleries.galleryms.ImplicationSet(
+            galleries.galleryms.RegularImplication(a, b)
+            for a, b in [("t", "shirt"), ("shirt", "top"), ("top", "t")]
+        )
+        self.assertEqual(implications.closure("shirt"), {"top", "t", "shirt"})
+        self.assertEqual(set(implications.implied_by({"shirt"})), {"top"})
+        self.assertEqual(
+            set(implications.implied_by({"shirt"}, transitive=True)),
+            {"top", "t", "shirt"},
+        )
+        tag_set = galleries.galleryms.TagSet({"t"})
+        tag_set.apply_implications(implications)
+        self.assertEqual(tag_set, {"t", "shirt", "top"})
+
+    def test_descriptor_set(self):
+        words = ["green", "light", "light_green", "red"]
+        descriptors = galleries.galleryms.DescriptorSet(words)
+        self.assertEqual(len(descriptors), 4)
+        self.assertIn(galleries.galleryms.DescriptorImplication("red"), descriptors)
+        self.assertNotIn(galleries.galleryms.DescriptorImplication("blue"), descriptors)
+        tag_set = galleries.galleryms.TagSet(
+            {"light_green_shirt", "red_hat", "green_", "blue_scarf"}
+        )
+        tag_set.apply_implications(descriptors)
+        self.assertEqual(
+            tag_set,
+            {
+                "light_green_shirt",
+                "green_shirt",
+                "shirt",
+                "red_hat",
+                "hat",
+                "green_",
+                "blue_scarf",
+            },
+        )
+
 
 class TestSplitOnWhitespace(unittest.TestCase):
     WHITESPACE_CHARACTERS = frozenset("\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0")
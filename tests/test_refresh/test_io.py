@@ -1,5 +1,7 @@
 """Tests for I/O functions of refresh, using pytest"""
 
+import concurrent.futures
+
 import pytest
 
 import galleries.galleryms
@@ -82,6 +84,44 @@ def test_gardener_update_count(tmp_path):
     assert isinstance(raises_ctx.value.__cause__, FileNotFoundError)
 
 
+@pytest.mark.parametrize("max_workers", [None, 0, 1, 4])
+def test_gardener_update_count_order(tmp_path, monkeypatch, max_workers):
+    names = [f"folder {n}" for n in range(200)]
+    for n, name in enumerate(names):
+        (tmp_path / name).mkdir()
+        for i in range(n % 5):
+            (tmp_path / name / str(i)).touch()
+    if max_workers is None or max_workers <= 1:
+        # Folders are listed inline, without starting any threads
+        monkeypatch.delattr(concurrent.futures, "ThreadPoolExecutor")
+    gard = galleries.refresh.Gardener()
+    gard.set_update_count("Path", "Count", root_path=tmp_path, max_workers=max_workers)
+    gallery_gen = (galleries.galleryms.Gallery(Path=name) for name in names)
+    results = [(g["Path"], g["Count"]) for g in gard.garden_rows(gallery_gen)]
+    assert results == [(name, n % 5) for n, name in enumerate(names)]
+
+
+def test_gardener_update_count_mtime(tmp_path):
+    (tmp_path / "folder").mkdir()
+    (tmp_path / "folder" / "1").touch()
+    gard = galleries.refresh.Gardener()
+    gard.set_update_count("Path", "Count", root_path=tmp_path, mtime_field="MTime")
+    assert "MTime" in gard.needed_fields
+    gallery = galleries.galleryms.Gallery(Path="folder", Count="", MTime="")
+    (gallery,) = gard.garden_rows([gallery])
+    assert gallery["Count"] == 1
+    mtime = gallery["MTime"]
+    assert mtime
+    # Unmodified folders are not listed again
+    gallery["Count"] = "999"
+    (gallery,) = gard.garden_rows([gallery])
+    assert gallery["Count"] == "999"
+    gallery["MTime"] = "0"
+    (gallery,) = gard.garden_rows([gallery])
+    assert gallery["Count"] == 1
+    assert gallery["MTime"] == mtime
+
+
 def test_get_tags_from_single_file(tmp_path):
     path = tmp_path / "tag_file_0.txt"
     path.write_bytes(b"".join(RAND_DATA))
@@ -150,3 +190,19 @@ def test_tag_actions_object_invalid(tmp_path, caplog):
     # JSONDecodeError is caught
     galleries.refresh.TagActionsObject().read_file(path)
     assert any(record.levelname == "ERROR" for record in caplog.records)
+
+
+@pytest.mark.parametrize("walk_dir_fds", [True, False])
+def test_traverse_fs(tmp_path, monkeypatch, walk_dir_fds):
+    if walk_dir_fds and not galleries.refresh._WALK_DIR_FDS:
+        pytest.skip("directory file descriptors not supported")
+    monkeypatch.setattr(galleries.refresh, "_WALK_DIR_FDS", walk_dir_fds)
+    for folder in ["a/b", "a/.hidden", "c"]:
+        (tmp_path / folder).mkdir(parents=True)
+    for file in ["a/1", "a/b/1", "a/b/2", "a/.hidden/1", "c/.1"]:
+        (tmp_path / file).touch()
+    (tmp_path / "a/b/link").symlink_to(tmp_path / "c", target_is_directory=True)
+    results = dict(galleries.refresh.traverse_fs(tmp_path))
+    assert results == {tmp_path / "a": 1, tmp_path / "a/b": 3}
+    leaves = dict(galleries.refresh.traverse_fs(tmp_path, leaves_only=True))
+    assert leaves == {tmp_path / "a/b": 3}
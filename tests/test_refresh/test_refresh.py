@@ -93,6 +93,18 @@ class TestGardener(RefreshTestCase):
                 gallery["Field2"], str, "Field2 not converted to TagSet"
             )
 
+    def test_repeated_tagstrings(self):
+        fieldname = "Field1"
+        self.gard.set_remove_tags(self._mask, fieldname)
+        rows = [galleries.galleryms.Gallery(mapping) for mapping in self._data * 2]
+        gallery_1, gallery_2 = self.gard.garden_rows(rows)
+        self.assertEqual(gallery_1[fieldname], {"expected"})
+        self.assertEqual(gallery_2[fieldname], {"expected"})
+        self.assertIsInstance(gallery_2[fieldname], galleries.galleryms.TagSet)
+        # Each gallery gets its own TagSet
+        gallery_1[fieldname].add("changed")
+        self.assertEqual(gallery_2[fieldname], {"expected"})
+
 
 class TestTagActionsObject(RefreshTestCase):
     simple = {
@@ -272,6 +284,17 @@ class TestTagActionsObject(RefreshTestCase):
         self.assertEqual(implicators[0][0], {fieldname, *"ABC"})
         self._assert_implicators_equal(implic, implicators[0][1])
 
+    def test_implicator_cache(self):
+        fieldname = "TAGS"
+        self.tao.default_tag_fields = frozenset([fieldname])
+        self.tao.update(self.multiple_updates[0])
+        implic = self.tao.get_implicator(fieldname)
+        self.assertIs(self.tao.get_implicator(fieldname), implic)
+        self.tao.update(self.multiple_updates[1])
+        implic = self.tao.get_implicator(fieldname)
+        self.assertEqual(implic.aliases.get("kitty"), "cat")
+        self.assertEqual(implic.tags_implied_by("striped_cat"), {"cat"})
+
     def test_get_with_unknown_fieldname(self):
         implic = self.tao.get_implicator("X")
         self.assertFalse(implic.implications)
@@ -358,5 +381,26 @@ class TestValidateTagActions(RefreshTestCase):
         self._assert_log(cm, "a -> b -> c -> a", "x -> y -> z", "'a'", "'c'")
 
 
+class TestWordMultiplier(unittest.TestCase):
+    def test_chain_three_sets(self):
+        wm = galleries.refresh.WordMultiplier()
+        wm.add_set("sizes", ["big", "small"])
+        for name, words in SETS.items():
+            wm.add_set(name, words)
+        pairs = list(wm.chain(["sizes", "colors", "things"], join="_".join))
+        # Each pair is yielded once, though "red_car" follows every size
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertEqual(len(pairs), 9 + 2 * 9)
+        self.assertIn(("red_car", "car"), pairs)
+        self.assertIn(("big_red_car", "red_car"), pairs)
+
+    def test_chain_empty_set(self):
+        wm = galleries.refresh.WordMultiplier()
+        wm.add_set("empty", [])
+        wm.add_set("things", SETS["things"])
+        self.assertEqual(list(wm.chain(["things", "empty"])), [])
+        self.assertEqual(list(wm.chain(["empty", "things"])), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -39,3 +39,15 @@ def test_results_table():
         number_format in printer.tabulator.field_fmts
         for number_format in printer.formats
     )
+
+
+@pytest.mark.parametrize("sort_by", galleries.relatedtag.SimilarityResult.choices())
+@pytest.mark.parametrize("limit", [None, 2])
+def test_sort(sort_by, limit):
+    table = galleries.galleryms.OverlapTable(
+        set("abc"), set("acd"), set("ade"), set("ab")
+    )
+    rows = [galleries.relatedtag.make_row(sim) for sim in table.similarities("a")]
+    rows.sort(key=lambda row: getattr(row, sort_by), reverse=True)
+    result = galleries.relatedtag.sort(table.similarities("a"), sort_by, n=limit)
+    assert result == rows[:limit]
@@ -1,6 +1,8 @@
 """Unit tests for util"""
 
+import tempfile
 import unittest
+from pathlib import Path
 
 import galleries.galleryms
 import galleries.util
@@ -35,6 +37,37 @@ class TestReader(unittest.TestCase):
         self.assertEqual(exc.fieldnames, self._FIELDNAMES_OUT)
         self.assertEqual(exc.line_num, 2)
 
+    def test_parse_tag_fields(self):
+        reader = galleries.util.StrictReader([self._FIELDNAMES_IN, "f,b a,h"])
+        (gallery,) = galleries.util.parse_tag_fields(
+            galleries.util.Reader(reader), ["G"]
+        )
+        self.assertEqual(gallery["F"], "f")
+        self.assertIsInstance(gallery["G"], galleries.galleryms.TagSet)
+        self.assertEqual(gallery["G"], {"a", "b"})
+        self.assertIs(gallery.normalize_tags("G"), gallery["G"])
+
+
+class TestLoadFromJSON(unittest.TestCase):
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir, "data.json")
+            path.write_text('{"a": ["b", 1]}', encoding="utf-8")
+            self.assertEqual(galleries.util.load_from_json(path), {"a": ["b", 1]})
+
+    def test_byte_order_mark(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir, "data.json")
+            path.write_text('{"a": ["b", 1]}', encoding="utf-8-sig")
+            self.assertEqual(galleries.util.load_from_json(path), {"a": ["b", 1]})
+
+    def test_invalid(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir, "data.json")
+            path.write_text("{", encoding="utf-8")
+            with self.assertLogs(level="ERROR"):
+                self.assertEqual(galleries.util.load_from_json(path), {})
+
 
 class TestSorting(unittest.TestCase):
     GALLERIES_PATH_DATA = [